@@ -22,7 +22,7 @@ export default function QuizAccuracyCard() {
                     return;
                 }
 
-                const response = await axios.get(`http://localhost:8000/api/quizzes/accuracy/${username}`, {
+                const response = await axios.get(`http://localhost:8000/api/quizzes/accuracy/${username}?limit=5`, {
                     headers: {
                         'Authorization': `Bearer ${token}`
                     }
@@ -63,7 +63,8 @@ export default function QuizAccuracyCard() {
     }
 
     // Get the last 5 quiz scores for the graph
-    const recentScores = quizData?.quiz_accuracy?.slice(-5).map(qa => qa.score) || [];
+    // Attempts come back newest first; plot them oldest to newest
+    const recentScores = quizData?.quiz_accuracy?.slice(0, 5).reverse().map(qa => qa.score) || [];
     const maxScore = Math.max(...recentScores, 100); // Ensure we have at least 100 as max
     
     // Generate points string
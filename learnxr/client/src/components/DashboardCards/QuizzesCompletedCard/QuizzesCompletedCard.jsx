@@ -22,7 +22,7 @@ export default function QuizzesCompletedCard() {
                     return;
                 }
 
-                const response = await axios.get(`http://localhost:8000/api/quizzes/accuracy/${username}`, {
+                const response = await axios.get(`http://localhost:8000/api/quizzes/accuracy/${username}?limit=3`, {
                     headers: {
                         'Authorization': `Bearer ${token}`
                     }
@@ -63,7 +63,7 @@ export default function QuizzesCompletedCard() {
     }
 
     const totalQuizzes = quizData?.total_quizzes_completed || 0;
-    const recentQuizzes = quizData?.quiz_accuracy?.slice(-3) || [];
+    const recentQuizzes = quizData?.quiz_accuracy?.slice(0, 3).reverse() || [];
     const heights = recentQuizzes.map(qa => (qa.score / 100) * 16); // Scale heights to max 16
 
     return (
@@ -22,7 +22,7 @@ export default function RecentQuizzesCard() {
                     return;
                 }
 
-                const response = await axios.get(`http://localhost:8000/api/quizzes/accuracy/${username}`, {
+                const response = await axios.get(`http://localhost:8000/api/quizzes/recent/${username}?limit=5`, {
                     headers: {
                         'Authorization': `Bearer ${token}`
                     }
@@ -63,7 +63,8 @@ export default function RecentQuizzesCard() {
         );
     }
 
-    const recentQuizzes = quizData?.quiz_accuracy?.slice(-5).reverse() || [];
+    // Attempts come back newest first
+    const recentQuizzes = quizData?.quiz_accuracy || [];
 
     return (
         <div className="bg-[#242452] border-8 border-[#0F0D2D] rounded-[25px] text-white px-6 py-10 w-full">
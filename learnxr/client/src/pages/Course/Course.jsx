@@ -8,14 +8,19 @@ export default function Course() {
     const { courseTitle } = useParams();
     const navigate = useNavigate();
     const [course, setCourse] = useState(null);
+    const [lessons, setLessons] = useState({});
+    const [openLesson, setOpenLesson] = useState(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
 
     useEffect(() => {
         const fetchCourse = async () => {
             try {
-                const response = await axios.get(`http://localhost:8000/api/courses/${encodeURIComponent(courseTitle)}`);
+                // Only lesson titles are loaded up front; lesson bodies are fetched on demand
+                const response = await axios.get(`http://localhost:8000/api/courses/${encodeURIComponent(courseTitle)}/outline`);
                 setCourse(response.data);
+                setLessons({});
+                setOpenLesson(response.data.lessons?.[0]?.lesson_number ?? null);
                 setError(null);
             } catch (error) {
                 console.error('Error fetching course:', error);
@@ -28,6 +33,24 @@ export default function Course() {
         fetchCourse();
     }, [courseTitle]);
 
+    useEffect(() => {
+        if (openLesson === null || lessons[openLesson]) {
+            return;
+        }
+
+        const fetchLesson = async () => {
+            try {
+                const response = await axios.get(`http://localhost:8000/api/courses/${encodeURIComponent(courseTitle)}/lessons/${openLesson}`);
+                setLessons(prev => ({ ...prev, [openLesson]: response.data }));
+            } catch (error) {
+                console.error('Error fetching lesson:', error);
+                setError('Failed to load lesson content. Please try again.');
+            }
+        };
+
+        fetchLesson();
+    }, [courseTitle, openLesson, lessons]);
+
     const handleTakeQuiz = () => {
         if (!course || !course._id) {
             console.error('Course data is missing:', course);
@@ -106,39 +129,57 @@ export default function Course() {
                 <div className="mb-12">
                     <h2 className="text-2xl font-semibold mb-6">Course Content</h2>
                     <div className="space-y-6">
-                        {course.lessons?.map((lesson, index) => (
-                            <div key={index} className="bg-[#1E1B4B] rounded-lg p-6">
-                                <div className="flex items-center mb-4">
-                                    <span className="w-8 h-8 bg-[#3b348b] rounded-full flex items-center justify-center mr-3 text-sm font-medium">
-                                        {lesson.lesson_number}
-                                    </span>
-                                    <h3 className="text-xl font-semibold">{lesson.title}</h3>
-                                </div>
-                                <p className="text-[#b0aaff] mb-4">{lesson.content}</p>
-                                {lesson.examples && (
-                                    <div className="mt-4">
-                                        <h4 className="text-lg font-medium mb-2">Examples</h4>
-                                        <div className="bg-[#0F0D2D] rounded p-4">
-                                            <pre className="text-[#b0aaff] whitespace-pre-wrap">
-                                                {lesson.examples}
-                                            </pre>
+                        {course.lessons?.map((outline) => {
+                            const lesson = lessons[outline.lesson_number];
+                            const isOpen = openLesson === outline.lesson_number;
+
+                            return (
+                                <div key={outline.lesson_number} className="bg-[#1E1B4B] rounded-lg p-6">
+                                    <button
+                                        onClick={() => setOpenLesson(isOpen ? null : outline.lesson_number)}
+                                        className="flex items-center w-full text-left"
+                                    >
+                                        <span className="w-8 h-8 bg-[#3b348b] rounded-full flex items-center justify-center mr-3 text-sm font-medium">
+                                            {outline.lesson_number}
+                                        </span>
+                                        <h3 className="text-xl font-semibold">{outline.title}</h3>
+                                    </button>
+                                    {isOpen && !lesson && (
+                                        <div className="animate-pulse mt-4">
+                                            <div className="h-4 bg-[#0F0D2D] rounded w-3/4 mb-2"></div>
+                                            <div className="h-4 bg-[#0F0D2D] rounded w-2/3"></div>
                                         </div>
-                                    </div>
-                                )}
-                                {lesson.quiz && (
-                                    <div className="mt-6 border-t border-[#3b348b] pt-4">
-                                        <h4 className="text-lg font-medium mb-3">Lesson Quiz</h4>
-                                        <p className="text-[#b0aaff] mb-4">
-                                            This lesson includes a quiz with {lesson.quiz.length} questions to test your understanding.
-                                        </p>
-                                        <div className="bg-[#0F0D2D] rounded p-4">
-                                            <h5 className="font-medium mb-2">Sample Question:</h5>
-                                            <p className="text-[#b0aaff]">{lesson.quiz[0].question}</p>
+                                    )}
+                                    {isOpen && lesson && (
+                                        <div className="mt-4">
+                                            <p className="text-[#b0aaff] mb-4">{lesson.content}</p>
+                                            {lesson.examples && (
+                                                <div className="mt-4">
+                                                    <h4 className="text-lg font-medium mb-2">Examples</h4>
+                                                    <div className="bg-[#0F0D2D] rounded p-4">
+                                                        <pre className="text-[#b0aaff] whitespace-pre-wrap">
+                                                            {lesson.examples}
+                                                        </pre>
+                                                    </div>
+                                                </div>
+                                            )}
+                                            {lesson.quiz?.length > 0 && (
+                                                <div className="mt-6 border-t border-[#3b348b] pt-4">
+                                                    <h4 className="text-lg font-medium mb-3">Lesson Quiz</h4>
+                                                    <p className="text-[#b0aaff] mb-4">
+                                                        This lesson includes a quiz with {lesson.quiz.length} questions to test your understanding.
+                                                    </p>
+                                                    <div className="bg-[#0F0D2D] rounded p-4">
+                                                        <h5 className="font-medium mb-2">Sample Question:</h5>
+                                                        <p className="text-[#b0aaff]">{lesson.quiz[0].question}</p>
+                                                    </div>
+                                                </div>
+                                            )}
                                         </div>
-                                    </div>
-                                )}
-                            </div>
-                        ))}
+                                    )}
+                                </div>
+                            );
+                        })}
                     </div>
                 </div>
 
@@ -151,7 +192,7 @@ export default function Course() {
                         Take Course Quiz
                     </button>
                     <p className="text-[#b0aaff] mt-2 text-sm">
-                        Test your knowledge with {course.lessons?.reduce((total, lesson) => total + (lesson.quiz?.length || 0), 0)} questions
+                        Test your knowledge with {course.lessons?.reduce((total, lesson) => total + (lesson.question_count || 0), 0)} questions
                     </p>
                 </div>
             </div>
@@ -17,7 +17,7 @@ export default function Dashboard() {
 
     const fetchCourses = async () => {
         try {
-            const response = await axios.get(`http://localhost:8000/api/courses?t=${Date.now()}`);
+            const response = await axios.get(`http://localhost:8000/api/courses`);
             
             // Clear any existing courses before setting new ones
             setCourses([]);
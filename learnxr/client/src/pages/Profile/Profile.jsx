@@ -36,8 +36,12 @@ export default function Profile() {
                 setProfileUser(userData);
                 
                 // Check if current user is following the profile user
-                if (loggedInUser && userData.followers) {
-                    setIsFollowing(userData.followers.includes(loggedInUser.username));
+                if (loggedInUser && loggedInUser.username !== username) {
+                    const followResponse = await fetch(`${API}/api/users/username/${loggedInUser.username}/following/${username}`);
+                    if (followResponse.ok) {
+                        const followData = await followResponse.json();
+                        setIsFollowing(followData.following);
+                    }
                 }
             } catch (err) {
                 setError(err.message);
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+import numpy as np
+import catalog
+
+logger = logging.getLogger(__name__)
+
+UNANSWERED = -1
+MAX_OPTION = 255
+
+def answer_matrix(attempts: List[dict], total_questions: int) -> np.ndarray:
+    """attempts x questions matrix of selected option indexes, UNANSWERED where a question was skipped"""
+    selected = np.full((len(attempts), total_questions), UNANSWERED, dtype=np.int16)
+    for row, attempt in enumerate(attempts):
+        for index, option in (attempt.get("answers") or {}).items():
+            index = int(index)
+            # Older attempts stored selected options as strings
+            option = int(option)
+            if 0 <= index < total_questions and 0 <= option <= MAX_OPTION:
+                selected[row, index] = option
+    return selected
+
+def item_statistics(selected: np.ndarray, correct: np.ndarray, option_counts: np.ndarray) -> dict:
+    """Classical item analysis for every question in one pass.
+
+    - difficulty: share of attempts answering the question correctly (skips count as wrong)
+    - discrimination: point-biserial correlation between answering the question correctly
+      and the attempt's score on the remaining questions
+    - option_rates: share of attempts choosing each option; column 0 is unanswered
+    """
+    attempts, questions = selected.shape
+    max_options = int(option_counts.max()) if questions else 0
+    is_correct = (selected == correct[np.newaxis, :]).astype(np.float64)
+
+    difficulty = is_correct.mean(axis=0) if attempts else np.full(questions, np.nan)
+
+    # Correlate each item with the rest score so the item doesn't correlate with itself
+    rest = is_correct.sum(axis=1, keepdims=True) - is_correct
+    item_dev = is_correct - is_correct.mean(axis=0) if attempts else is_correct
+    rest_dev = rest - rest.mean(axis=0) if attempts else rest
+    denominator = np.sqrt((item_dev ** 2).sum(axis=0) * (rest_dev ** 2).sum(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        discrimination = np.where(denominator > 0, (item_dev * rest_dev).sum(axis=0) / denominator, np.nan)
+
+    # Count choices per (question, option) with a single bincount; out-of-range options are dropped
+    width = max_options + 1
+    valid = (selected >= UNANSWERED) & (selected < option_counts[np.newaxis, :])
+    slots = np.arange(questions)[np.newaxis, :] * width + (selected + 1)
+    counts = np.bincount(slots[valid], minlength=questions * width).reshape(questions, width)
+    option_rates = counts / attempts if attempts else counts.astype(np.float64)
+
+    return {
+        "difficulty": difficulty,
+        "discrimination": discrimination,
+        "option_rates": option_rates
+    }
+
+def _rate(value) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 4)
+
+def course_analytics(course: dict, attempts: List[dict]) -> dict:
+    questions = [
+        (lesson.get("lesson_number"), question_index, question)
+        for lesson in course.get("lessons", [])
+        for question_index, question in enumerate(lesson.get("quiz") or [])
+    ]
+    correct = np.array([int(question["correct_answer"]) for _, _, question in questions], dtype=np.int16)
+    option_counts = np.array([len(question.get("options") or []) for _, _, question in questions], dtype=np.int16)
+
+    stats = item_statistics(answer_matrix(attempts, len(questions)), correct, option_counts)
+
+    items = []
+    for index, (lesson_number, question_index, question) in enumerate(questions):
+        rates = stats["option_rates"][index]
+        items.append({
+            "index": index,
+            "lesson_number": lesson_number,
+            "question_index": question_index,
+            "question": question.get("question"),
+            "correct_answer": int(correct[index]),
+            "difficulty": _rate(stats["difficulty"][index]),
+            "discrimination": _rate(stats["discrimination"][index]),
+            "unanswered_rate": _rate(rates[0]),
+            "options": [
+                {"option": option, "rate": _rate(rates[option_index + 1]), "correct": bool(option_index == correct[index])}
+                for option_index, option in enumerate(question.get("options") or [])
+            ]
+        })
+
+    return {
+        "course_id": str(course["_id"]),
+        "course_title": course.get("title", ""),
+        "attempts": len(attempts),
+        "questions": items
+    }
+
+# course_id -> (stamp, analytics); the stamp changes whenever an attempt is added or the catalog changes
+_results: Dict[str, tuple] = {}
+_locks: Dict[str, asyncio.Lock] = {}
+
+async def _stamp(db, course_id: str) -> tuple:
+    # Attempts are only ever inserted, so the count grows with every submission however late
+    # its submitted_at is; it's counted from the course_submitted_at index alone
+    attempts = await db.quiz_attempts.count_documents({"course_id": course_id})
+    return (await catalog.current_version(db), attempts)
+
+async def get_course_analytics(db, course: dict) -> dict:
+    """Return cached analytics for a course, recomputing them when new attempts have arrived"""
+    course_id = str(course["_id"])
+    stamp = await _stamp(db, course_id)
+    cached = _results.get(course_id)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    async with _locks.setdefault(course_id, asyncio.Lock()):
+        cached = _results.get(course_id)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        started = time.perf_counter()
+        attempts = await db.quiz_attempts.find({"course_id": course_id}, {"_id": 0, "answers": 1}).to_list(length=None)
+        # Keep the number crunching off the event loop
+        result = await asyncio.get_running_loop().run_in_executor(None, course_analytics, course, attempts)
+        _results[course_id] = (stamp, result)
+        logger.info(f"Computed analytics for {result['course_title']} over {len(attempts)} attempts in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return result
@@ -2,6 +2,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
 import os
 from dotenv import load_dotenv
 import logging
@@ -10,8 +12,6 @@ from bson import ObjectId
 from typing import Optional
 from passlib.context import CryptContext
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -27,7 +27,24 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 security = HTTPBearer()
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# bcrypt takes tens to hundreds of milliseconds per call, so it runs on a bounded pool
+# instead of the event loop. bcrypt releases the GIL, so threads are the default.
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Calls waiting beyond this are rejected with 503 instead of queueing without bound
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "256"))
+
+_hash_pool = None
+_hash_pool_stats = {
+    "in_flight": 0,
+    "max_queue_depth": 0,
+    "completed": 0,
+    "failed": 0,
+    "rejected": 0
+}
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -35,6 +52,59 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def password_hash_pool_stats() -> dict:
+    in_flight = _hash_pool_stats["in_flight"]
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "queue_depth": max(0, in_flight - PASSWORD_HASH_WORKERS),
+        **_hash_pool_stats
+    }
+
+def _get_hash_pool():
+    global _hash_pool
+    if _hash_pool is None:
+        if PASSWORD_HASH_EXECUTOR == "process":
+            _hash_pool = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+        else:
+            _hash_pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+    return _hash_pool
+
+async def _run_in_hash_pool(fn, *args):
+    stats = _hash_pool_stats
+    if stats["in_flight"] - PASSWORD_HASH_WORKERS >= PASSWORD_HASH_MAX_QUEUE:
+        stats["rejected"] += 1
+        logger.warning(f"Password hash queue full ({PASSWORD_HASH_MAX_QUEUE} waiting), rejecting request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again",
+            headers={"Retry-After": "1"},
+        )
+
+    stats["in_flight"] += 1
+    stats["max_queue_depth"] = max(stats["max_queue_depth"], stats["in_flight"] - PASSWORD_HASH_WORKERS)
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(_get_hash_pool(), fn, *args)
+    except BaseException:
+        # Includes cancellation, e.g. the client disconnecting while the hash was queued
+        stats["failed"] += 1
+        raise
+    finally:
+        stats["in_flight"] -= 1
+    stats["completed"] += 1
+    return result
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_pool(get_password_hash, password)
+
+def shutdown_password_hash_pool():
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=True, cancel_futures=True)
+        _hash_pool = None
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
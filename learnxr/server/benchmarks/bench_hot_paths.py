@@ -0,0 +1,224 @@
+"""Micro-benchmarks for the server's pure-Python hot paths, checked against stored baselines.
+
+Each case runs on realistic and worst-case data: a seed course and a 2000-question
+course for grading, users with 30 (the stored cap) and 5000 login history entries,
+and 2000 quiz attempts for serialization. convert_objectid_to_str no longer exists;
+the serializer that replaced it (serialization.dumps) is measured instead.
+
+Each case's time is the median of 15 repeats. Baselines are kept per runner (BENCH_RUNNER,
+or the platform, Python version and CPU count), since timings from one machine say nothing
+about another; record them on the machine that runs the check with --save. A case fails
+when its median exceeds the baseline by more than its tolerance on the first run and on
+two re-measurements. The tolerance is the case's entry in CASE_THRESHOLDS or
+BENCH_REGRESSION_THRESHOLD percent (default 25), widened for cases whose repeats were
+spread out when the baseline was recorded. Without baselines for the runner the results
+are only reported, unless --require-baselines is given: CI passes it with BENCH_RUNNER
+set, so a runner whose baselines were never recorded fails instead of skipping the check.
+
+Run from the server directory:
+    python -m benchmarks.bench_hot_paths [case ...] [--save] [--threshold PCT] [--require-baselines]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+from bson import ObjectId
+from jose import jwt
+from grading import GradingPlan
+from models.user import UserResponse
+from routes.user import ALGORITHM, SECRET_KEY, create_access_token, update_streak
+from seed import load_initial_courses
+from serialization import dumps
+
+BASELINES_FILE = Path(__file__).resolve().parent / "baselines.json"
+THRESHOLD = float(os.getenv("BENCH_REGRESSION_THRESHOLD", "25"))
+# Allowed slowdown in percent for cases that vary more than the rest between runs:
+# JWT timings are dominated by HMAC and base64 in C, and are small enough for cache effects to show
+CASE_THRESHOLDS = {
+    "jwt_encode": 40,
+    "jwt_decode": 40
+}
+# Tolerance is at least this many times the interquartile range recorded with the baseline
+NOISE_FACTOR = 3
+REPEATS = 15
+RETRIES = 2
+
+def runner() -> str:
+    return os.getenv("BENCH_RUNNER") or (
+        f"{platform.system().lower()}-{platform.machine()}-py{sys.version_info[0]}.{sys.version_info[1]}-{os.cpu_count()}cpu"
+    )
+
+def login_history(count: int) -> list:
+    start = datetime(2020, 1, 1)
+    return [{"date": start + timedelta(days=day), "streak_count": day % 30 + 1} for day in range(count)]
+
+def user_document(logins: int) -> dict:
+    now = datetime(2024, 6, 1)
+    return {
+        "_id": ObjectId(),
+        "username": "benchmark",
+        "email": "benchmark@example.com",
+        "current_streak": 12,
+        "longest_streak": 40,
+        "login_history": login_history(logins),
+        "last_login": now,
+        "role": "Student",
+        "about": "",
+        "followers_count": 10,
+        "following_count": 10,
+        "created_at": now,
+        "updated_at": now
+    }
+
+def quiz_attempts(count: int) -> list:
+    courses = load_initial_courses()
+    user_id = str(ObjectId())
+    start = datetime(2022, 1, 1)
+    return [{
+        "_id": f"attempt-{index}",
+        "user_id": user_id,
+        "course_id": str(ObjectId()),
+        "quiz_id": str(ObjectId()),
+        "course_title": courses[index % len(courses)]["title"],
+        "score": index % 101,
+        "answers": {str(question): question % 4 for question in range(10)},
+        "submitted_at": start + timedelta(hours=index)
+    } for index in range(count)]
+
+def large_course(questions: int) -> dict:
+    lessons = [{
+        "lesson_number": lesson + 1,
+        "quiz": [{"question": f"Q{lesson}.{index}", "correct_answer": index % 4} for index in range(20)]
+    } for lesson in range(questions // 20)]
+    return {"_id": ObjectId(), "title": "Large course", "lessons": lessons}
+
+def grading_case(course: dict):
+    plan = GradingPlan(course)
+    answers = {str(index): (correct + index) % 4 for index, correct in enumerate(plan.correct_answers)}
+    return lambda: plan.grade(answers)
+
+def seed_course() -> dict:
+    """The seed course with the most questions"""
+    courses = [{"_id": ObjectId(), **course} for course in load_initial_courses()]
+    return max(courses, key=lambda course: GradingPlan(course).total_questions)
+
+def grading_plan_case(course: dict):
+    return lambda: GradingPlan(course)
+
+def serialize_case(document):
+    return lambda: dumps(document)
+
+def user_response_case(logins: int):
+    user = user_document(logins)
+    user["id"] = str(user.pop("_id"))
+    return lambda: UserResponse(**user)
+
+def jwt_decode_case():
+    token = create_access_token({"sub": str(ObjectId())})
+    return lambda: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+def update_streak_case(days_since_login: int):
+    now = datetime(2024, 6, 1, 9)
+    user = {"last_login": now - timedelta(days=days_since_login), "current_streak": 5, "longest_streak": 9}
+    return lambda: update_streak(user, now)
+
+# name -> factory returning the callable to time; data is built once, outside the timing
+CASES = {
+    "update_streak[consecutive]": lambda: update_streak_case(1),
+    "update_streak[broken]": lambda: update_streak_case(5),
+    "grading_plan[seed course]": lambda: grading_plan_case(seed_course()),
+    "grade[seed course]": lambda: grading_case(seed_course()),
+    "grade[2000 questions]": lambda: grading_case(large_course(2000)),
+    "serialize_user[30 logins]": lambda: serialize_case(user_document(30)),
+    "serialize_user[5000 logins]": lambda: serialize_case(user_document(5000)),
+    "serialize_attempts[2000]": lambda: serialize_case({"quiz_accuracy": quiz_attempts(2000)}),
+    "jwt_encode": lambda: lambda: create_access_token({"sub": "6650c0ffee0000000000beef"}),
+    "jwt_decode": jwt_decode_case,
+    "user_response[30 logins]": lambda: user_response_case(30),
+    "user_response[5000 logins]": lambda: user_response_case(5000)
+}
+
+def measure(function) -> dict:
+    """Median per-call microseconds over REPEATS repeats of ~0.05 s each, and their relative spread"""
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * 0.05 / max(elapsed, 1e-9)))
+    samples = [seconds / number * 1e6 for seconds in timer.repeat(number=number, repeat=REPEATS)]
+    median = statistics.median(samples)
+    quartiles = statistics.quantiles(samples, n=4)
+    return {"us": median, "spread": (quartiles[2] - quartiles[0]) / median}
+
+def run(names=None) -> dict:
+    return {name: measure(CASES[name]()) for name in names or CASES}
+
+def tolerance(name: str, baseline: dict, threshold: float) -> float:
+    """Allowed slowdown in percent for one case"""
+    return max(CASE_THRESHOLDS.get(name, threshold), NOISE_FACTOR * baseline.get("spread", 0) * 100)
+
+def compare(results: dict, baselines: dict, threshold: float) -> list:
+    """Names of cases slower than their baseline by more than their tolerance"""
+    return [
+        name for name, result in results.items()
+        if name in baselines and result["us"] > baselines[name]["us"] * (1 + tolerance(name, baselines[name], threshold) / 100)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_hot_paths")
+    parser.add_argument("cases", nargs="*", help="default: all")
+    parser.add_argument("--save", action="store_true", help="record these results as the new baselines")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown in percent")
+    parser.add_argument("--require-baselines", action="store_true", help="fail when this runner has no baselines")
+    args = parser.parse_args()
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case: {', '.join(unknown)}")
+
+    results = run(args.cases)
+    stored = json.loads(BASELINES_FILE.read_text()) if BASELINES_FILE.exists() else {}
+    baselines = stored.get(runner(), {})
+    regressions = compare(results, baselines, args.threshold)
+    # Re-measure apparent regressions and keep the faster result, so one noisy run doesn't fail the check
+    for _ in range(RETRIES):
+        if not regressions or args.save:
+            break
+        for name, result in run(regressions).items():
+            if result["us"] < results[name]["us"]:
+                results[name] = result
+        regressions = compare(results, baselines, args.threshold)
+
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline:
+            change = f"{(result['us'] / baseline['us'] - 1) * 100:+6.1f}% (allowed {tolerance(name, baseline, args.threshold):.0f}%)"
+        else:
+            change = "   new"
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<30} {result['us']:>10.2f} us  spread {result['spread'] * 100:4.1f}%  {change}{flag}")
+
+    if args.save:
+        baselines.update({
+            name: {"us": float(f"{result['us']:.4g}"), "spread": round(result["spread"], 3)}
+            for name, result in results.items()
+        })
+        stored[runner()] = baselines
+        BASELINES_FILE.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"Saved baselines for {runner()} to {BASELINES_FILE.name}")
+    elif not baselines:
+        print(f"No baselines for {runner()}; results are not checked. Record them on this machine with --save.")
+        if args.require_baselines:
+            sys.exit(1)
+    elif regressions:
+        print(f"{len(regressions)} case(s) regressed beyond their tolerance")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Caller-side logging cost of grading one quiz submission.
+
+legacy:  the lines submit_quiz used to emit (about four INFO lines per answer plus the
+         submission dump), written synchronously by a root StreamHandler as basicConfig set up
+current: one structured summary line through the queue handler; answer detail is debug only
+current+sampled: as current, with the answer detail record enabled and sampled at 1%
+
+Output goes to a temporary file in every case. Only time spent in the calling thread is
+measured, which is what the event loop pays.
+
+Run from the server directory:
+    python -m benchmarks.bench_logging [submissions]
+"""
+import logging
+import os
+import sys
+import tempfile
+import timeit
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+from bson import ObjectId
+import logging_config
+from grading import GradingPlan
+from logging_config import LogFields, SamplingFilter
+from routes import quizzes
+from seed import load_initial_courses
+
+logger = logging.getLogger("routes.quizzes")
+
+def legacy_logging(plan, answers: dict, user: dict, score: float, correct_answers: int):
+    total_questions = plan.total_questions
+    logger.info(f"Received quiz submission for course {plan.course_id}")
+    logger.info(f"Current user data: {user}")
+    logger.info(f"Submission data: {dict(answers=answers)}")
+    logger.info(f"Found course: {plan.course_title}")
+    logger.info(f"Total questions in course: {total_questions}")
+    for q_idx_str, selected_ans_idx in answers.items():
+        q_idx = int(q_idx_str)
+        if 0 <= q_idx < total_questions:
+            lesson_number, question_index = plan.locate(q_idx)
+            correct_answer_index = plan.correct_answers[q_idx]
+            logger.info(f"\nQuestion {q_idx} (lesson {lesson_number}, question {question_index}):")
+            logger.info(f"Submitted answer index: {selected_ans_idx}")
+            logger.info(f"Correct answer index: {correct_answer_index}")
+            logger.info("Answer is correct!" if selected_ans_idx == correct_answer_index else "Answer is incorrect")
+    logger.info(f"\nFinal score calculation:")
+    logger.info(f"Correct answers: {correct_answers}")
+    logger.info(f"Total questions: {total_questions}")
+    logger.info(f"Score: {score}%")
+    logger.info(f"Updated user's quiz accuracy and stats")
+
+def current_logging(plan, answers: dict, user: dict, score: float, correct_answers: int):
+    quizzes.log_answers(plan, answers)
+    logger.info(LogFields(
+        "Quiz submitted",
+        user_id=user["id"],
+        course_id=plan.course_id,
+        correct=correct_answers,
+        total=plan.total_questions,
+        score=round(score, 1)
+    ))
+
+def measure(log, plan, answers, number: int) -> float:
+    user = {"id": str(ObjectId()), "username": "benchmark"}
+    correct_answers = plan.grade(answers)
+    score = correct_answers / plan.total_questions * 100
+    return timeit.timeit(lambda: log(plan, answers, user, score, correct_answers), number=number) / number
+
+def run(number: int = 2000) -> dict:
+    course = load_initial_courses()[0]
+    plan = GradingPlan({"_id": ObjectId(), **course})
+    answers = {str(index): (correct + index) % 4 for index, correct in enumerate(plan.correct_answers)}
+    results = {}
+
+    with tempfile.TemporaryFile("w") as output:
+        root = logging.getLogger()
+        root.setLevel(logging.INFO)
+        handler = logging.StreamHandler(output)
+        handler.setFormatter(logging.Formatter(logging_config.LOG_FORMAT))
+        root.addHandler(handler)
+        results["legacy"] = measure(legacy_logging, plan, answers, number)
+        root.removeHandler(handler)
+
+        logging_config.configure_logging(stream=output)
+        results["current"] = measure(current_logging, plan, answers, number)
+
+        quizzes.answer_logger.setLevel(logging.DEBUG)
+        quizzes.answer_logger.addFilter(SamplingFilter(0.01))
+        results["current+sampled"] = measure(current_logging, plan, answers, number)
+        logging_config.stop()
+
+    return {"questions": plan.total_questions, "dropped": logging_config.dropped_records(), **results}
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    results = run(number)
+    print(f"{number} submissions of {results['questions']} answers each (dropped records: {results['dropped']})")
+    for mode in ("legacy", "current", "current+sampled"):
+        print(f"{mode:<16} {results[mode] * 1e6:>8.1f} us per submission  x{results['legacy'] / results[mode]:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Event-loop latency for unrelated requests during a burst of logins.
+
+A ticker coroutine stands in for unrelated endpoints: it sleeps 5 ms at a time and
+records how late it wakes up. A burst of concurrent logins then verifies passwords
+either inline on the event loop (the old behaviour) or through the bounded hash pool.
+
+Run from the server directory:
+    python -m benchmarks.bench_password_hashing [logins]
+"""
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+import auth
+
+PASSWORD = "correct horse battery staple"
+TICK_SECONDS = 0.005
+
+async def inline_verify(plain_password: str, hashed_password: str) -> bool:
+    return auth.verify_password(plain_password, hashed_password)
+
+async def measure(verify, hashed: str, logins: int) -> dict:
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(time.perf_counter() - started - TICK_SECONDS)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK_SECONDS * 4)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[verify(PASSWORD, hashed) for _ in range(logins)])
+    elapsed = time.perf_counter() - started
+    assert all(results)
+
+    done.set()
+    await ticker_task
+
+    lags.sort()
+    return {
+        "burst_seconds": elapsed,
+        "lag_p50_ms": lags[len(lags) // 2] * 1000,
+        "lag_p99_ms": lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000,
+        "lag_max_ms": lags[-1] * 1000
+    }
+
+async def run(logins: int = 20) -> dict:
+    hashed = auth.get_password_hash(PASSWORD)
+    results = {
+        "inline": await measure(inline_verify, hashed, logins),
+        "pool": await measure(auth.verify_password_async, hashed, logins)
+    }
+    auth.shutdown_password_hash_pool()
+    return results
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{logins} concurrent logins, bcrypt rounds={auth.BCRYPT_ROUNDS}, pool workers={auth.PASSWORD_HASH_WORKERS}")
+    for mode, result in asyncio.run(run(logins)).items():
+        print(
+            f"{mode:<7} burst {result['burst_seconds']:>6.2f} s  "
+            f"loop lag p50 {result['lag_p50_ms']:>8.1f} ms  p99 {result['lag_p99_ms']:>8.1f} ms  "
+            f"max {result['lag_max_ms']:>8.1f} ms"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare the legacy response path with the shared single-pass serializer.
+
+The legacy path is what routes did before: convert_objectid_to_str rebuilt the
+document, FastAPI's jsonable_encoder walked it again, and JSONResponse ran
+json.dumps. The payload is the seed courses as they come back from Motor, i.e.
+with ObjectIds and datetimes.
+
+Run from the server directory:
+    python -m benchmarks.bench_serialization
+"""
+import copy
+import json
+import timeit
+from datetime import datetime
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from models.course import with_slug
+from seed import load_initial_courses
+from serialization import dumps
+
+def convert_objectid_to_str(obj):
+    if isinstance(obj, dict):
+        return {k: convert_objectid_to_str(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [convert_objectid_to_str(item) for item in obj]
+    elif isinstance(obj, ObjectId):
+        return str(obj)
+    return obj
+
+def legacy_render(content) -> bytes:
+    encoded = jsonable_encoder(convert_objectid_to_str(content))
+    return json.dumps(encoded, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def make_catalog(copies: int = 1):
+    catalog = []
+    courses = load_initial_courses()
+    for _ in range(copies):
+        for course in courses:
+            doc = copy.deepcopy(with_slug(course))
+            doc["_id"] = ObjectId()
+            doc["created_at"] = datetime.utcnow()
+            doc["updated_at"] = datetime.utcnow()
+            catalog.append(doc)
+    return catalog
+
+def run(payload, number: int = 200) -> dict:
+    # Both paths must produce the same document
+    assert json.loads(legacy_render(payload)) == json.loads(dumps(payload))
+
+    legacy = min(timeit.repeat(lambda: legacy_render(payload), number=number, repeat=5)) / number
+    fast = min(timeit.repeat(lambda: dumps(payload), number=number, repeat=5)) / number
+    return {
+        "bytes": len(dumps(payload)),
+        "legacy_us": legacy * 1e6,
+        "single_pass_us": fast * 1e6,
+        "speedup": legacy / fast
+    }
+
+def main():
+    scenarios = [
+        ("GET /api/courses/{title}", make_catalog()[0], 1000),
+        ("GET /api/courses", make_catalog(), 200),
+        ("GET /api/courses x20", make_catalog(copies=20), 10),
+    ]
+    for label, payload, number in scenarios:
+        result = run(payload, number=number)
+        print(
+            f"{label:<26} {result['bytes']:>8} B  legacy {result['legacy_us']:>9.1f} us  "
+            f"single-pass {result['single_pass_us']:>8.1f} us  x{result['speedup']:.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
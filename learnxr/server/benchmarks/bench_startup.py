@@ -0,0 +1,63 @@
+"""Worker startup time: cold import of the app, then readiness.
+
+Each run boots a fresh interpreter that imports main (cold, no bytecode beyond what is
+already on disk) and then runs the app lifespan against MONGODB_URL: connect, warm
+the pool, ensure indexes, check the seed fingerprint and rebuild leaderboards. The
+first boot against an empty database includes seeding; later boots only read the
+fingerprint. Use --import-only when no MongoDB is reachable.
+
+Run from the server directory:
+    python -m benchmarks.bench_startup [runs] [--import-only]
+"""
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+def child(import_only: bool):
+    started = time.perf_counter()
+    import main
+    imported = time.perf_counter()
+    result = {"import_ms": (imported - started) * 1000}
+
+    if not import_only:
+        async def boot():
+            async with main.app.router.lifespan_context(main.app):
+                return time.perf_counter()
+        result["ready_ms"] = (asyncio.run(boot()) - imported) * 1000
+        result["total_ms"] = result["import_ms"] + result["ready_ms"]
+    print(json.dumps(result))
+
+def run(runs: int = 5, import_only: bool = False) -> list:
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [sys.executable, "-m", "benchmarks.bench_startup", "--child"]
+    if import_only:
+        command.append("--import-only")
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(command, cwd=server_dir, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    import_only = "--import-only" in sys.argv
+    if "--child" in sys.argv:
+        child(import_only)
+        return
+
+    runs = int(args[0]) if args else 5
+    results = run(runs, import_only)
+    print(f"{runs} cold worker boots")
+    for phase in results[0]:
+        values = [result[phase] for result in results]
+        print(f"{phase:<10} first {values[0]:>8.1f} ms  median {statistics.median(values):>8.1f} ms  min {min(values):>8.1f} ms")
+
+if __name__ == "__main__":
+    main()
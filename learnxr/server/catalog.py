@@ -0,0 +1,92 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from pymongo import ReturnDocument
+from serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# The catalog version lives in Mongo so every worker sees writes made by any other worker
+CATALOG_META_ID = "course_catalog"
+
+# How often a worker re-reads the shared catalog version (seconds)
+VERSION_CHECK_SECONDS = float(os.getenv("CATALOG_VERSION_CHECK_SECONDS", "5"))
+
+_version = None
+_version_checked_at = 0.0
+_entry = None  # (version, etag, body, slug -> {_id, title})
+_lock = asyncio.Lock()
+
+async def current_version(db) -> int:
+    """Return the catalog version, re-reading it from Mongo at most every VERSION_CHECK_SECONDS"""
+    global _version, _version_checked_at
+    now = time.monotonic()
+    if _version is not None and now - _version_checked_at < VERSION_CHECK_SECONDS:
+        return _version
+
+    meta = await db.meta.find_one({"_id": CATALOG_META_ID}, {"version": 1})
+    _version = meta["version"] if meta else 0
+    _version_checked_at = now
+    return _version
+
+async def bump_version(db) -> int:
+    """Mark the catalog as changed. Must be called after every write to the courses collection."""
+    global _version, _version_checked_at, _entry
+    meta = await db.meta.find_one_and_update(
+        {"_id": CATALOG_META_ID},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    _version = meta["version"]
+    _version_checked_at = time.monotonic()
+    _entry = None
+    logger.info(f"Course catalog version bumped to {_version}")
+    return _version
+
+async def _load(db):
+    """Return the (version, etag, body, index) cache entry, reloading only when the version changes"""
+    global _entry
+    version = await current_version(db)
+    entry = _entry
+    if entry and entry[0] == version:
+        return entry
+
+    async with _lock:
+        entry = _entry
+        if entry and entry[0] == version:
+            return entry
+
+        courses = await db.courses.find().to_list(length=None)
+        body = dumps(courses)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        index = {course["slug"]: {"_id": course["_id"], "title": course["title"]} for course in courses if course.get("slug")}
+        _entry = (version, etag, body, index)
+        logger.info(f"Loaded {len(courses)} courses into catalog cache (version {version})")
+        return _entry
+
+async def get_catalog(db):
+    """Return (etag, body) for the serialized course list"""
+    _, etag, body, _ = await _load(db)
+    return etag, body
+
+async def find_course(db, slug: str):
+    """Return {_id, title} for a course slug from the catalog cache, or None"""
+    _, _, _, index = await _load(db)
+    return index.get(slug)
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Evaluate an If-None-Match header against a strong ETag (weak comparison, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
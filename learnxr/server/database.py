@@ -1,11 +1,21 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne, IndexModel, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 import os
+import asyncio
+from datetime import datetime
+import threading
+import time
+from collections import deque
 from dotenv import load_dotenv
 import logging
-from models.course import INITIAL_COURSES
+from models.course import slugify, with_slug
+from models.quiz_accuracy import QuizAccuracy
+from models.user import FollowEdge
+import catalog
+import metrics
+from seed import SEED_META_ID, seed_fingerprint, load_initial_courses
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -16,34 +26,437 @@ MONGODB_URL = os.getenv("MONGODB_URL")
 if not MONGODB_URL:
     raise ValueError("MONGODB_URL environment variable is not set")
 
-try:
-    client = AsyncIOMotorClient(MONGODB_URL)
-    # Test the connection
-    client.admin.command('ping')
-    logger.info("Successfully connected to MongoDB")
-except Exception as e:
-    logger.error(f"Failed to connect to MongoDB: {str(e)}")
-    raise
+# Connection pool tuning; each worker process has its own pool, so size per worker
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MONGODB_WAIT_QUEUE_TIMEOUT_MS = os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS")
+MONGODB_COMPRESSORS = os.getenv("MONGODB_COMPRESSORS")  # e.g. "zstd,snappy,zlib"
+MONGODB_READ_PREFERENCE = os.getenv("MONGODB_READ_PREFERENCE", "primary")
 
-db = client.learnxr
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool counters from PyMongo's CMAP events.
 
-async def get_database():
+    Motor runs operations on executor threads, so callbacks arrive concurrently. A checkout's
+    start and finish happen on the same thread, which is how wait times are paired up.
+    """
+
+    def __init__(self, recent_waits: int = 1024):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._recent_waits = deque(maxlen=recent_waits)
+        self.connections_open = 0
+        self.connections_in_use = 0
+        self.max_in_use = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_wait_seconds_total = 0.0
+        self.checkout_wait_seconds_max = 0.0
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_open -= 1
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def _waited(self) -> float:
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return time.perf_counter() - started if started is not None else 0.0
+
+    def connection_checked_out(self, event):
+        waited = self._waited()
+        with self._lock:
+            self.checkouts += 1
+            self.connections_in_use += 1
+            self.max_in_use = max(self.max_in_use, self.connections_in_use)
+            self.checkout_wait_seconds_total += waited
+            self.checkout_wait_seconds_max = max(self.checkout_wait_seconds_max, waited)
+            self._recent_waits.append(waited)
+
+    def connection_check_out_failed(self, event):
+        self._waited()
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.connections_in_use -= 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            return {
+                "max_pool_size": MONGODB_MAX_POOL_SIZE,
+                "min_pool_size": MONGODB_MIN_POOL_SIZE,
+                "connections_open": self.connections_open,
+                "connections_in_use": self.connections_in_use,
+                "max_in_use": self.max_in_use,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checkout_wait_seconds_total": self.checkout_wait_seconds_total,
+                "checkout_wait_seconds_max": self.checkout_wait_seconds_max,
+                "checkout_wait_seconds_p50": waits[len(waits) // 2] if waits else 0.0,
+                "checkout_wait_seconds_p99": waits[min(len(waits) - 1, int(len(waits) * 0.99))] if waits else 0.0
+            }
+
+pool_metrics = PoolMetrics()
+
+# Set by connect() from the app lifespan
+client = None
+db = None
+
+def _client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": MONGODB_MIN_POOL_SIZE,
+        "readPreference": MONGODB_READ_PREFERENCE,
+        "event_listeners": [pool_metrics, metrics.command_metrics]
+    }
+    if MONGODB_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = int(MONGODB_WAIT_QUEUE_TIMEOUT_MS)
+    if MONGODB_COMPRESSORS:
+        options["compressors"] = MONGODB_COMPRESSORS
+    return options
+
+async def connect(mongo_client=None):
+    """Create the client, check connectivity and warm the pool. Called once per worker at startup.
+
+    A ready-made client (e.g. an in-memory stand-in) can be passed instead of connecting to MONGODB_URL.
+    """
+    global client, db
     try:
-        return db
+        client = mongo_client or AsyncIOMotorClient(MONGODB_URL, **_client_options())
+        await client.admin.command("ping")
+        db = client.learnxr
+        # Concurrent pings open minPoolSize connections before the worker takes traffic
+        if MONGODB_MIN_POOL_SIZE > 1:
+            await asyncio.gather(*[client.admin.command("ping") for _ in range(MONGODB_MIN_POOL_SIZE)])
+        logger.info(f"Successfully connected to MongoDB (pool {MONGODB_MIN_POOL_SIZE}-{MONGODB_MAX_POOL_SIZE})")
     except Exception as e:
-        logger.error(f"Database error: {str(e)}")
+        logger.error(f"Failed to connect to MongoDB: {str(e)}")
         raise
 
+def close():
+    global client, db
+    if client is not None:
+        client.close()
+    client = None
+    db = None
+
+async def get_database():
+    if db is None:
+        raise RuntimeError("Database is not connected")
+    return db
+
 async def initialize_courses():
     try:
-        # Check if courses already exist
-        existing_courses = await db.courses.find().to_list(length=1)
-        if not existing_courses:
-            # Insert initial courses
-            result = await db.courses.insert_many(INITIAL_COURSES)
-            logger.info(f"Initialized {len(result.inserted_ids)} courses")
-        else:
-            logger.info("Courses already exist, skipping initialization")
+        # Workers compare the seed fingerprint with one _id read and skip seeding when it matches
+        fingerprint = seed_fingerprint()
+        meta = await db.meta.find_one({"_id": SEED_META_ID}, {"fingerprint": 1})
+        if meta and meta.get("fingerprint") == fingerprint:
+            logger.info("Seed data is up to date, skipping initialization")
+            return
+
+        # Upsert by slug so existing courses keep their _id, which attempts and quizzes reference
+        courses = [with_slug(course) for course in load_initial_courses()]
+        try:
+            result = await db.courses.bulk_write([
+                UpdateOne({"slug": course["slug"]}, {"$set": course}, upsert=True)
+                for course in courses
+            ], ordered=False)
+            changed = result.upserted_count + result.modified_count
+        except BulkWriteError as e:
+            # Another worker seeding at the same time won the upsert race on the unique slug index
+            if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                raise
+            changed = e.details["nUpserted"] + e.details["nModified"]
+
+        await db.meta.update_one(
+            {"_id": SEED_META_ID},
+            {"$set": {"fingerprint": fingerprint, "seeded_at": datetime.utcnow()}},
+            upsert=True
+        )
+        if changed:
+            await catalog.bump_version(db)
+        logger.info(f"Seeded {len(courses)} courses ({changed} inserted or updated)")
     except Exception as e:
         logger.error(f"Error initializing courses: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
+
+# Every index the query paths rely on, by collection. ensure_indexes creates whatever is
+# missing and index_report lists what exists on the server but is not declared here.
+INDEXES = {
+    "users": [
+        # Sign-up relies on these to reject duplicates in a single insert
+        IndexModel("username", unique=True, name="username_unique"),
+        IndexModel("email", unique=True, name="email_unique"),
+        # Lets feed reads find the few accounts that are pulled instead of fanned out
+        IndexModel("followers_count", name="followers_count"),
+        # Only users whose follow counters need recomputing from the edges are indexed
+        IndexModel(
+            "follow_counts_stale",
+            name="follow_counts_stale",
+            partialFilterExpression={"follow_counts_stale": True}
+        )
+    ],
+    "courses": [
+        # Course pages and quizzes look courses up by slug
+        IndexModel("slug", unique=True, name="slug_unique")
+    ],
+    "quizzes": [
+        # One quiz per course; get_quiz upserts against this
+        IndexModel("course_id", unique=True, name="course_id_unique")
+    ],
+    "quiz_attempts": [
+        # Quiz history is read per user and per course, newest first
+        IndexModel([("user_id", 1), ("submitted_at", -1), ("_id", -1)], name="user_submitted_at"),
+        IndexModel([("course_id", 1), ("submitted_at", -1), ("_id", -1)], name="course_submitted_at")
+    ],
+    "follows": [
+        # Uniqueness doubles as the "does A follow B" point read
+        IndexModel([("follower_id", 1), ("followee_id", 1)], unique=True, name="follower_followee_unique"),
+        IndexModel([("followee_id", 1), ("_id", -1)], name="followee_id"),
+        IndexModel([("follower_id", 1), ("_id", -1)], name="follower_id")
+    ],
+    "feeds": [
+        # Feed buckets are read newest first per owner
+        IndexModel([("owner_id", 1), ("newest_at", -1)], name="owner_newest_at")
+    ]
+}
+
+# Writes to these collections rely on unique indexes instead of checking for duplicates first,
+# so the app must not serve traffic without them
+UNIQUE_INDEX_COLLECTIONS = {
+    collection for collection, indexes in INDEXES.items()
+    if any(index.document.get("unique") for index in indexes)
+}
+
+async def ensure_indexes(collections=None):
+    """Create declared indexes that don't exist yet and return the collections that failed.
+
+    Safe to run on every startup; a failure on one collection doesn't stop the others.
+    """
+    failed = []
+    for collection, indexes in INDEXES.items():
+        if collections and collection not in collections:
+            continue
+        existing = await db[collection].index_information()
+        missing = [index for index in indexes if index.document["name"] not in existing]
+        for index in indexes:
+            name = index.document["name"]
+            if name in existing and list(existing[name]["key"]) != list(index.document["key"].items()):
+                logger.warning(f"Index {collection}.{name} exists with keys {existing[name]['key']}, expected {list(index.document['key'].items())}")
+        if not missing:
+            continue
+        try:
+            await db[collection].create_indexes(missing)
+            logger.info(f"Created indexes on {collection}: {', '.join(index.document['name'] for index in missing)}")
+        except OperationFailure as e:
+            # e.g. existing duplicates block a unique index; keep going with the other collections
+            logger.error(f"Error creating indexes on {collection}: {str(e)}")
+            failed.append(collection)
+    return failed
+
+async def index_report() -> dict:
+    """Compare declared indexes with the server: missing, undeclared, and never used since restart"""
+    report = {}
+    for collection, indexes in INDEXES.items():
+        declared = {index.document["name"] for index in indexes}
+        existing = set(await db[collection].index_information()) - {"_id_"}
+        try:
+            stats = await db[collection].aggregate([{"$indexStats": {}}]).to_list(length=None)
+            unused = sorted(stat["name"] for stat in stats if stat["name"] != "_id_" and stat["accesses"]["ops"] == 0)
+        except (OperationFailure, NotImplementedError):
+            # $indexStats needs the indexStats privilege, and in-memory stand-ins don't implement it
+            unused = None
+        report[collection] = {
+            "missing": sorted(declared - existing),
+            "undeclared": sorted(existing - declared),
+            "unused": unused
+        }
+    return report
+
+async def log_index_report():
+    for collection, entry in (await index_report()).items():
+        if entry["missing"]:
+            logger.warning(f"Missing indexes on {collection}: {', '.join(entry['missing'])}")
+        if entry["undeclared"]:
+            logger.warning(f"Undeclared indexes on {collection}: {', '.join(entry['undeclared'])}")
+        if entry["unused"]:
+            logger.info(f"Indexes on {collection} unused since the server started: {', '.join(entry['unused'])}")
+
+def duplicate_key_field(error: DuplicateKeyError):
+    """Name the first field of the unique index a write collided with"""
+    key_pattern = (error.details or {}).get("keyPattern")
+    if key_pattern:
+        return next(iter(key_pattern))
+    # Servers before 4.2 only name the index in the message
+    for indexes in INDEXES.values():
+        for index in indexes:
+            if index.document["name"] in str(error):
+                return next(iter(index.document["key"]))
+    return None
+
+async def backfill_course_slugs():
+    try:
+        # Courses seeded before slugs existed need one before the unique index can be built, and
+        # slugs from an older slugify are rewritten; the catalog is small enough to check in full
+        updated = 0
+        async for course in db.courses.find({}, {"title": 1, "slug": 1}):
+            slug = slugify(course["title"])
+            if course.get("slug") != slug:
+                await db.courses.update_one({"_id": course["_id"]}, {"$set": {"slug": slug}})
+                updated += 1
+        if updated:
+            await catalog.bump_version(db)
+            logger.info(f"Backfilled slugs for {updated} courses")
+    except Exception as e:
+        logger.error(f"Error backfilling course slugs: {str(e)}")
+        raise
+
+async def remove_duplicate_quizzes():
+    try:
+        # Concurrent first requests used to create several quizzes per course; keep the oldest
+        duplicates = await db.quizzes.aggregate([
+            {"$sort": {"_id": 1}},
+            {"$group": {"_id": "$course_id", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}}
+        ]).to_list(length=None)
+        removed = 0
+        for duplicate in duplicates:
+            result = await db.quizzes.delete_many({"_id": {"$in": duplicate["ids"][1:]}})
+            removed += result.deleted_count
+        if removed:
+            logger.info(f"Removed {removed} duplicate quizzes")
+    except Exception as e:
+        logger.error(f"Error removing duplicate quizzes: {str(e)}")
+        raise
+
+# One-time migrations record completion in meta, so later worker starts skip their scans
+MIGRATIONS = ("quiz_attempts", "follow_edges")
+
+def migration_meta_id(name: str) -> str:
+    return f"migration:{name}"
+
+async def _migration_done(name: str) -> bool:
+    return await db.meta.find_one({"_id": migration_meta_id(name)}, {"_id": 1}) is not None
+
+async def _mark_migration_done(name: str):
+    await db.meta.update_one(
+        {"_id": migration_meta_id(name)},
+        {"$set": {"completed_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+async def migrate_quiz_attempts():
+    try:
+        if await _migration_done("quiz_attempts"):
+            return
+        # Attempts used to be pushed into users.quiz_accuracy; move them to quiz_attempts
+        migrated = 0
+        async for user in db.users.find({"quiz_accuracy": {"$exists": True}}, {"quiz_accuracy": 1}):
+            requests = []
+            for attempt in user.get("quiz_accuracy") or []:
+                document = QuizAccuracy(
+                    user_id=str(user["_id"]),
+                    course_id=attempt["quiz_id"],
+                    **attempt
+                ).to_document()
+                requests.append(UpdateOne({"_id": document["_id"]}, {"$setOnInsert": document}, upsert=True))
+            if requests:
+                await db.quiz_attempts.bulk_write(requests, ordered=False)
+            await db.users.update_one({"_id": user["_id"]}, {"$unset": {"quiz_accuracy": ""}})
+            migrated += len(requests)
+        await _mark_migration_done("quiz_attempts")
+        if migrated:
+            logger.info(f"Migrated {migrated} embedded quiz attempts to quiz_attempts")
+    except Exception as e:
+        logger.error(f"Error migrating quiz attempts: {str(e)}")
+        raise
+
+async def migrate_follow_edges():
+    try:
+        if not await _migration_done("follow_edges"):
+            await _migrate_follow_arrays()
+        # Marked users are found through the partial follow_counts_stale index, so this is
+        # cheap on every start; adjust_follow_counts marks users whose $inc failed
+        recounted = 0
+        async for user in db.users.find({"follow_counts_stale": True}, {"_id": 1}):
+            user_id = str(user["_id"])
+            await db.users.update_one({"_id": user["_id"]}, {
+                "$set": {
+                    "followers_count": await db.follows.count_documents({"followee_id": user_id}),
+                    "following_count": await db.follows.count_documents({"follower_id": user_id})
+                },
+                "$unset": {"follow_counts_stale": ""}
+            })
+            recounted += 1
+        if recounted:
+            logger.info(f"Recomputed follow counters for {recounted} users")
+    except Exception as e:
+        logger.error(f"Error migrating follow edges: {str(e)}")
+        raise
+
+async def _migrate_follow_arrays():
+    # Follows used to be username arrays on both users; rebuild them as follows edges
+    migrated = 0
+    async for user in db.users.find(
+        {"$or": [{"followers": {"$exists": True}}, {"following": {"$exists": True}}]},
+        {"following": 1}
+    ):
+        following = user.get("following") or []
+        if following:
+            followees = await db.users.find({"username": {"$in": following}}, {"_id": 1}).to_list(length=None)
+            requests = [
+                UpdateOne(
+                    {"follower_id": str(user["_id"]), "followee_id": str(followee["_id"])},
+                    {"$setOnInsert": FollowEdge(
+                        follower_id=str(user["_id"]),
+                        followee_id=str(followee["_id"])
+                    ).dict()},
+                    upsert=True
+                )
+                for followee in followees if followee["_id"] != user["_id"]
+            ]
+            if requests:
+                await db.follows.bulk_write(requests, ordered=False)
+                await db.users.update_many(
+                    {"_id": {"$in": [followee["_id"] for followee in followees]}},
+                    {"$set": {"follow_counts_stale": True}}
+                )
+                migrated += len(requests)
+        # The marker is set in the same write that drops the arrays, so a crash before the
+        # counters are recomputed leaves it behind for the next run
+        await db.users.update_one(
+            {"_id": user["_id"]},
+            {"$unset": {"followers": "", "following": ""}, "$set": {"follow_counts_stale": True}}
+        )
+    if migrated:
+        logger.info(f"Migrated {migrated} follow relationships to follows edges")
+
+    # Users from before the counters existed have neither field; recount them with the rest
+    await db.users.update_many(
+        {"$or": [{"followers_count": {"$exists": False}}, {"following_count": {"$exists": False}}]},
+        {"$set": {"follow_counts_stale": True}}
+    )
+    await _mark_migration_done("follow_edges")
@@ -0,0 +1,153 @@
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Optional
+from bson import ObjectId
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Each user's feed is a series of bucket documents holding up to FEED_BUCKET_SIZE events,
+# capped at FEED_MAX_BUCKETS buckets per user
+FEED_BUCKET_SIZE = int(os.getenv("FEED_BUCKET_SIZE", "50"))
+FEED_MAX_BUCKETS = int(os.getenv("FEED_MAX_BUCKETS", "20"))
+
+# Accounts with more followers than this are not fanned out on write; their followers
+# pull the account's recent attempts when reading the feed instead
+FEED_FANOUT_FOLLOWER_LIMIT = int(os.getenv("FEED_FANOUT_FOLLOWER_LIMIT", "10000"))
+FEED_FANOUT_BATCH_SIZE = 1000
+HIGH_FANOUT_REFRESH_SECONDS = 60
+
+_high_fanout_accounts = {}  # user id -> username
+_high_fanout_refreshed_at = 0.0
+
+def quiz_completed_event(actor_id: str, actor_username: str, attempt) -> dict:
+    return {
+        "id": str(ObjectId()),
+        "type": "quiz_completed",
+        "actor_id": actor_id,
+        "actor_username": actor_username,
+        "course_id": attempt.course_id,
+        "course_title": attempt.course_title,
+        "score": attempt.score,
+        "created_at": attempt.submitted_at
+    }
+
+async def _push_to_feeds(db, owner_ids: list, event: dict):
+    created_at = event["created_at"]
+    # Append to each owner's open bucket, or start a new one when it is full
+    result = await db.feeds.bulk_write([
+        UpdateOne(
+            {"owner_id": owner_id, "count": {"$lt": FEED_BUCKET_SIZE}},
+            {
+                "$push": {"items": event},
+                "$inc": {"count": 1},
+                "$max": {"newest_at": created_at},
+                "$min": {"oldest_at": created_at}
+            },
+            upsert=True
+        )
+        for owner_id in owner_ids
+    ], ordered=False)
+
+    # A new bucket was started for these owners; drop buckets beyond the cap
+    for index in result.upserted_ids:
+        owner_id = owner_ids[index]
+        stale = await db.feeds.find({"owner_id": owner_id}, {"_id": 1}).sort(
+            "newest_at", -1
+        ).skip(FEED_MAX_BUCKETS).to_list(length=None)
+        if stale:
+            await db.feeds.delete_many({"_id": {"$in": [bucket["_id"] for bucket in stale]}})
+
+async def fan_out_quiz_completion(db, user_id: str, attempt):
+    """Push a quiz completion into every follower's feed. Runs after the response is sent."""
+    try:
+        actor = await db.users.find_one({"_id": ObjectId(user_id)}, {"username": 1, "followers_count": 1})
+        if not actor or actor.get("followers_count", 0) == 0:
+            return
+        if actor["followers_count"] > FEED_FANOUT_FOLLOWER_LIMIT:
+            return
+
+        started = time.perf_counter()
+        event = quiz_completed_event(user_id, actor["username"], attempt)
+        delivered = 0
+        batch = []
+        async for edge in db.follows.find({"followee_id": user_id}, {"follower_id": 1}):
+            batch.append(edge["follower_id"])
+            if len(batch) >= FEED_FANOUT_BATCH_SIZE:
+                await _push_to_feeds(db, batch, event)
+                delivered += len(batch)
+                batch = []
+        if batch:
+            await _push_to_feeds(db, batch, event)
+            delivered += len(batch)
+
+        logger.info(f"Fanned out quiz completion by {actor['username']} to {delivered} feeds in {(time.perf_counter() - started) * 1000:.1f}ms")
+    except Exception as e:
+        logger.error(f"Error fanning out feed event: {str(e)}")
+
+async def _get_high_fanout_accounts(db) -> dict:
+    global _high_fanout_accounts, _high_fanout_refreshed_at
+    now = time.monotonic()
+    if now - _high_fanout_refreshed_at >= HIGH_FANOUT_REFRESH_SECONDS:
+        accounts = await db.users.find(
+            {"followers_count": {"$gt": FEED_FANOUT_FOLLOWER_LIMIT}},
+            {"username": 1}
+        ).to_list(length=None)
+        _high_fanout_accounts = {str(account["_id"]): account["username"] for account in accounts}
+        _high_fanout_refreshed_at = now
+    return _high_fanout_accounts
+
+async def _pull_high_fanout_events(db, user_id: str, accounts: dict, before: Optional[datetime], limit: int) -> list:
+    if not accounts:
+        return []
+
+    edges = await db.follows.find(
+        {"follower_id": user_id, "followee_id": {"$in": list(accounts)}},
+        {"followee_id": 1}
+    ).to_list(length=None)
+    if not edges:
+        return []
+
+    query = {"user_id": {"$in": [edge["followee_id"] for edge in edges]}}
+    if before:
+        query["submitted_at"] = {"$lte": before}
+    attempts = await db.quiz_attempts.find(query, {"answers": 0}).sort(
+        "submitted_at", -1
+    ).limit(limit).to_list(length=limit)
+    return [
+        {
+            "id": attempt["_id"],
+            "type": "quiz_completed",
+            "actor_id": attempt["user_id"],
+            "actor_username": accounts[attempt["user_id"]],
+            "course_id": attempt["course_id"],
+            "course_title": attempt["course_title"],
+            "score": attempt["score"],
+            "created_at": attempt["submitted_at"]
+        }
+        for attempt in attempts
+    ]
+
+async def read_feed(db, user_id: str, limit: int, before: Optional[tuple] = None) -> list:
+    """Return up to limit + 1 feed events, newest first, older than the (created_at, id) cursor"""
+    query = {"owner_id": user_id}
+    if before:
+        query["oldest_at"] = {"$lte": before[0]}
+
+    # One indexed range query over the user's buckets
+    bucket_count = limit // FEED_BUCKET_SIZE + 2
+    buckets = await db.feeds.find(query, {"items": 1}).sort("newest_at", -1).limit(bucket_count).to_list(length=bucket_count)
+    # Events fanned out before an account crossed the limit are served by the pull instead
+    accounts = await _get_high_fanout_accounts(db)
+    events = [
+        event for bucket in buckets for event in bucket["items"]
+        if event["actor_id"] not in accounts
+    ]
+    events.extend(await _pull_high_fanout_events(db, user_id, accounts, before[0] if before else None, limit + 1))
+
+    if before:
+        events = [event for event in events if (event["created_at"], event["id"]) < before]
+    events.sort(key=lambda event: (event["created_at"], event["id"]), reverse=True)
+    return events[:limit + 1]
@@ -0,0 +1,89 @@
+import logging
+from typing import Dict, Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+import catalog
+
+logger = logging.getLogger(__name__)
+
+class GradingPlan:
+    """Flattened answer key for a course.
+
+    Global question indexes follow the order the quiz page presents them: lessons in
+    stored order, each lesson's quiz questions in order. Lessons may have any number
+    of questions.
+    """
+    __slots__ = ("course_id", "course_title", "correct_answers", "lesson_numbers", "question_indexes")
+
+    def __init__(self, course: dict):
+        self.course_id = str(course["_id"])
+        self.course_title = course.get("title", "")
+        correct_answers = []
+        lesson_numbers = []
+        question_indexes = []
+        for lesson in course.get("lessons", []):
+            for question_index, question in enumerate(lesson.get("quiz") or []):
+                correct_answers.append(int(question["correct_answer"]))
+                lesson_numbers.append(lesson.get("lesson_number"))
+                question_indexes.append(question_index)
+        self.correct_answers = tuple(correct_answers)
+        self.lesson_numbers = tuple(lesson_numbers)
+        self.question_indexes = tuple(question_indexes)
+
+    @property
+    def total_questions(self) -> int:
+        return len(self.correct_answers)
+
+    def locate(self, index: int):
+        """Return (lesson_number, question_index) for a global question index"""
+        return self.lesson_numbers[index], self.question_indexes[index]
+
+    def grade(self, answers: Dict[str, int]) -> int:
+        """Count correct answers; indexes outside the answer key are ignored"""
+        key = self.correct_answers
+        total = len(key)
+        correct = 0
+        for index, selected in answers.items():
+            index = int(index)
+            if 0 <= index < total and key[index] == selected:
+                correct += 1
+        return correct
+
+# course_id -> (catalog version, plan)
+_plans: Dict[str, tuple] = {}
+
+async def get_grading_plan(db, course_id: str) -> Optional[GradingPlan]:
+    """Return the cached grading plan for a course, compiling it when the catalog version changes"""
+    version = await catalog.current_version(db)
+    cached = _plans.get(course_id)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    try:
+        object_id = ObjectId(course_id)
+    except (InvalidId, TypeError):
+        return None
+
+    # Only the fields the answer key needs, not lesson content
+    course = await db.courses.find_one(
+        {"_id": object_id},
+        {"title": 1, "lessons.lesson_number": 1, "lessons.quiz.correct_answer": 1}
+    )
+    if not course:
+        return None
+
+    plan = GradingPlan(course)
+    _plans[course_id] = (version, plan)
+    logger.info(f"Compiled grading plan for {plan.course_title} ({plan.total_questions} questions)")
+    return plan
+
+async def warm_grading_plans(db) -> int:
+    """Compile grading plans for every course in one query, e.g. before a worker takes traffic"""
+    version = await catalog.current_version(db)
+    courses = await db.courses.find(
+        {},
+        {"title": 1, "lessons.lesson_number": 1, "lessons.quiz.correct_answer": 1}
+    ).to_list(length=None)
+    for course in courses:
+        _plans[str(course["_id"])] = (version, GradingPlan(course))
+    return len(courses)
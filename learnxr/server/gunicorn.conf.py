@@ -0,0 +1,19 @@
+import multiprocessing
+import os
+
+# Production serving: one uvicorn event loop per worker process, so CPU-bound work
+# (bcrypt, large JSON responses) only blocks the worker it runs on
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "workers.DrainingUvicornWorker"
+
+# Import the app once in the master and fork; each worker still opens its own Mongo
+# client and warms its caches in the lifespan before it accepts traffic
+preload_app = os.getenv("PRELOAD_APP", "true").lower() == "true"
+
+# Must exceed DRAIN_SECONDS plus the slowest request, or drained workers get killed
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+accesslog = "-"
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import os
+import time
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_METRICS = ("average_score", "total_quizzes_completed", "longest_streak")
+
+# Each worker keeps its own boards, updated as its own requests change scores. A background
+# rebuild from Mongo every REBUILD_SECONDS picks up writes made by other workers.
+REBUILD_SECONDS = int(os.getenv("LEADERBOARD_REBUILD_SECONDS", "300"))
+
+class Leaderboard:
+    """Users ordered by score, highest first, ties broken by user id.
+
+    Keys are kept in a sorted list, so rank lookups are a bisect and top-N is a slice.
+    """
+
+    def __init__(self):
+        self._keys: List[tuple] = []  # (-score, user_id)
+        self._scores: Dict[str, float] = {}
+
+    @classmethod
+    def from_scores(cls, scores: Dict[str, float]) -> "Leaderboard":
+        board = cls()
+        board._scores = dict(scores)
+        board._keys = sorted((-score, user_id) for user_id, score in scores.items())
+        return board
+
+    def __len__(self):
+        return len(self._keys)
+
+    def update(self, user_id: str, score: float):
+        previous = self._scores.get(user_id)
+        if previous == score:
+            return
+        if previous is not None:
+            del self._keys[bisect_left(self._keys, (-previous, user_id))]
+        self._scores[user_id] = score
+        insort(self._keys, (-score, user_id))
+
+    def remove(self, user_id: str):
+        previous = self._scores.pop(user_id, None)
+        if previous is not None:
+            del self._keys[bisect_left(self._keys, (-previous, user_id))]
+
+    def rank(self, user_id: str) -> Optional[int]:
+        """1-based rank, or None when the user is not on the board"""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return bisect_left(self._keys, (-score, user_id)) + 1
+
+    def score(self, user_id: str) -> Optional[float]:
+        return self._scores.get(user_id)
+
+    def top(self, n: int) -> List[tuple]:
+        """(user_id, score) pairs for the first n ranks"""
+        return [(user_id, -negated) for negated, user_id in self._keys[:n]]
+
+_global: Dict[str, Leaderboard] = {metric: Leaderboard() for metric in GLOBAL_METRICS}
+_courses: Dict[str, Leaderboard] = {}  # course_id -> board by best_score
+_usernames: Dict[str, str] = {}
+# Updates made while a rebuild is scanning, replayed onto the new boards so the older scan can't undo them
+_changes: Optional[list] = None
+
+def _record_change(function, *args):
+    if _changes is not None:
+        _changes.append((function, args))
+
+def get_board(metric: str) -> Optional[Leaderboard]:
+    return _global.get(metric)
+
+def get_course_board(course_id: str) -> Leaderboard:
+    return _courses.get(course_id) or Leaderboard()
+
+def username(user_id: str) -> Optional[str]:
+    return _usernames.get(user_id)
+
+def record_quiz_stats(user: dict):
+    """Fold a user's stats, as returned after a quiz submission, into the boards"""
+    _record_change(record_quiz_stats, user)
+    user_id = str(user["_id"])
+    _usernames[user_id] = user["username"]
+    if user.get("total_quizzes_completed", 0) > 0:
+        _global["average_score"].update(user_id, user.get("average_score", 0))
+        _global["total_quizzes_completed"].update(user_id, user["total_quizzes_completed"])
+    for course_id, stats in (user.get("course_stats") or {}).items():
+        if "best_score" in stats:
+            _courses.setdefault(course_id, Leaderboard()).update(user_id, stats["best_score"])
+
+def record_streak(user_id: str, username: str, longest_streak: int):
+    _record_change(record_streak, user_id, username, longest_streak)
+    _usernames[user_id] = username
+    if longest_streak > 0:
+        _global["longest_streak"].update(user_id, longest_streak)
+
+def rename_user(user_id: str, username: str):
+    _record_change(rename_user, user_id, username)
+    if user_id in _usernames:
+        _usernames[user_id] = username
+
+def remove_user(user_id: str):
+    _record_change(remove_user, user_id)
+    _usernames.pop(user_id, None)
+    for board in _global.values():
+        board.remove(user_id)
+    for board in _courses.values():
+        board.remove(user_id)
+
+async def rebuild(db):
+    """Replace the boards with a fresh scan of the users collection"""
+    global _global, _courses, _usernames, _changes
+    started = time.perf_counter()
+    scores: Dict[str, Dict[str, float]] = {metric: {} for metric in GLOBAL_METRICS}
+    course_scores: Dict[str, Dict[str, float]] = {}
+    usernames: Dict[str, str] = {}
+    changes = _changes = []
+
+    try:
+        cursor = db.users.find({}, {
+            "username": 1,
+            "average_score": 1,
+            "total_quizzes_completed": 1,
+            "longest_streak": 1,
+            "course_stats": 1
+        })
+        async for user in cursor:
+            user_id = str(user["_id"])
+            usernames[user_id] = user["username"]
+            if user.get("total_quizzes_completed", 0) > 0:
+                scores["average_score"][user_id] = user.get("average_score", 0)
+                scores["total_quizzes_completed"][user_id] = user["total_quizzes_completed"]
+            if user.get("longest_streak", 0) > 0:
+                scores["longest_streak"][user_id] = user["longest_streak"]
+            for course_id, stats in (user.get("course_stats") or {}).items():
+                if "best_score" in stats:
+                    course_scores.setdefault(course_id, {})[user_id] = stats["best_score"]
+    except BaseException:
+        _changes = None
+        raise
+
+    # Sorting each board once is cheaper than inserting users one at a time
+    boards = {metric: Leaderboard.from_scores(scores[metric]) for metric in GLOBAL_METRICS}
+    courses = {course_id: Leaderboard.from_scores(board) for course_id, board in course_scores.items()}
+    _global, _courses, _usernames = boards, courses, usernames
+    _changes = None
+    for function, args in changes:
+        function(*args)
+    logger.info(f"Rebuilt leaderboards for {len(usernames)} users in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+async def refresh_periodically(db):
+    """Rebuild the boards every REBUILD_SECONDS; run as a background task for the worker's lifetime"""
+    while True:
+        await asyncio.sleep(REBUILD_SECONDS)
+        try:
+            await rebuild(db)
+        except Exception as e:
+            logger.error(f"Error rebuilding leaderboards: {str(e)}")
@@ -0,0 +1,41 @@
+import logging
+import os
+import time
+import catalog
+from grading import warm_grading_plans
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker keeps serving after SIGTERM while /ready reports draining, so load
+# balancers stop routing to it before it closes its listener (gunicorn mode only)
+DRAIN_SECONDS = float(os.getenv("DRAIN_SECONDS", "5"))
+
+STARTING = "starting"
+READY = "ready"
+DRAINING = "draining"
+
+_state = STARTING
+
+def state() -> str:
+    return _state
+
+def is_ready() -> bool:
+    return _state == READY
+
+def mark_ready():
+    global _state
+    if _state == STARTING:
+        _state = READY
+
+def start_draining():
+    global _state
+    if _state != DRAINING:
+        _state = DRAINING
+        logger.info("Worker is draining")
+
+async def warmup(db):
+    """Fill the per-worker caches the hot paths read, so the first requests don't pay for them"""
+    started = time.perf_counter()
+    await catalog.get_catalog(db)
+    plans = await warm_grading_plans(db)
+    logger.info(f"Warmed catalog and {plans} grading plans in {(time.perf_counter() - started) * 1000:.1f}ms")
@@ -0,0 +1,6 @@
+"""Offline load tests: the ASGI app driven in process against an in-memory database.
+
+Run from the server directory:
+    python -m loadtest [scenario ...] [--concurrency N] [--iterations N] [--latency-ms MS]
+    python -m loadtest.dataset [--scale S] [--layout L] [--seed N] [--drop] [--in-memory]
+"""
@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+import json
+import sys
+from loadtest.runner import run
+from loadtest.scenarios import SCENARIOS
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Run load scenarios against the app in process")
+    parser.add_argument("scenarios", nargs="*", help=f"any of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent simulated clients")
+    parser.add_argument("--iterations", type=int, default=20, help="scenario steps per client")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated Mongo round-trip time")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    results = asyncio.run(run(args.scenarios or list(SCENARIOS), args.concurrency, args.iterations, args.latency_ms, args.seed))
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    if any(result["errors"] for result in results["scenarios"].values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import asyncio
+import time
+from mongomock_motor import AsyncMongoMockClient
+import metrics
+
+# Collection methods that are one round trip to the server, and the command they send
+COMMANDS = {
+    "find_one": "find",
+    "find_one_and_update": "findAndModify",
+    "find_one_and_replace": "findAndModify",
+    "find_one_and_delete": "findAndModify",
+    "insert_one": "insert",
+    "insert_many": "insert",
+    "update_one": "update",
+    "update_many": "update",
+    "replace_one": "update",
+    "delete_one": "delete",
+    "delete_many": "delete",
+    "bulk_write": "bulkWrite",
+    "count_documents": "aggregate",
+    "estimated_document_count": "count",
+    "distinct": "distinct",
+    "create_index": "createIndexes",
+    "create_indexes": "createIndexes",
+    "drop_index": "dropIndexes",
+    "index_information": "listIndexes",
+    "drop": "drop"
+}
+
+class InMemoryClient:
+    """Motor-compatible client backed by mongomock, for tests that run without MongoDB.
+
+    Every call is reported like a real command (metrics and per-request round trips), and
+    latency_ms adds a simulated network round trip so chatty handlers show up in timings.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self._client = AsyncMongoMockClient()
+        self.latency = latency_ms / 1000
+
+    async def _round_trip(self, command: str, collection: str, call):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        started = time.perf_counter()
+        try:
+            result = call()
+            if asyncio.iscoroutine(result):
+                result = await result
+        except Exception:
+            metrics.observe_command(command, collection, time.perf_counter() - started + self.latency, failed=True)
+            raise
+        metrics.observe_command(command, collection, time.perf_counter() - started + self.latency)
+        return result
+
+    def __getitem__(self, name: str) -> "InMemoryDatabase":
+        return InMemoryDatabase(self, self._client[name])
+
+    def __getattr__(self, name: str) -> "InMemoryDatabase":
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def close(self):
+        self._client.close()
+
+class InMemoryDatabase:
+    def __init__(self, client: InMemoryClient, database):
+        self._client = client
+        self._database = database
+
+    async def command(self, command, *args, **kwargs):
+        name = command if isinstance(command, str) else next(iter(command))
+        return await self._client._round_trip(name, "", lambda: self._database.command(command, *args, **kwargs))
+
+    def __getitem__(self, name: str) -> "InMemoryCollection":
+        return InMemoryCollection(self._client, self._database[name])
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+class InMemoryCollection:
+    def __init__(self, client: InMemoryClient, collection):
+        self._client = client
+        self._collection = collection
+
+    @property
+    def name(self) -> str:
+        return self._collection.name
+
+    def find(self, *args, **kwargs) -> "InMemoryCursor":
+        return InMemoryCursor(self._client, self.name, "find", self._collection.find(*args, **kwargs))
+
+    def aggregate(self, *args, **kwargs) -> "InMemoryCursor":
+        # The pipeline runs when the cursor is first read, as it would on the server
+        return InMemoryCursor(self._client, self.name, "aggregate", lambda: self._collection.aggregate(*args, **kwargs))
+
+    def __getattr__(self, name: str):
+        method = getattr(self._collection, name)
+        command = COMMANDS.get(name)
+        if command is None:
+            return method
+
+        async def round_trip(*args, **kwargs):
+            return await self._client._round_trip(command, self.name, lambda: method(*args, **kwargs))
+        return round_trip
+
+class InMemoryCursor:
+    """Reads the whole result in one round trip on the first to_list or iteration"""
+
+    def __init__(self, client: InMemoryClient, collection: str, command: str, cursor):
+        self._client = client
+        self._collection = collection
+        self._command = command
+        self._cursor = cursor
+        self._documents = None
+
+    def __getattr__(self, name: str):
+        # sort, skip, limit, batch_size... apply to the underlying cursor and chain
+        method = getattr(self._cursor, name)
+
+        def chain(*args, **kwargs):
+            method(*args, **kwargs)
+            return self
+        return chain
+
+    async def _fetch(self) -> list:
+        if self._documents is None:
+            async def read():
+                cursor = self._cursor() if callable(self._cursor) else self._cursor
+                return await cursor.to_list(length=None)
+            self._documents = await self._client._round_trip(self._command, self._collection, read)
+        return self._documents
+
+    async def to_list(self, length=None) -> list:
+        documents = await self._fetch()
+        return documents if length is None else documents[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in await self._fetch():
+            yield document
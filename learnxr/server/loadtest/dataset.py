@@ -0,0 +1,276 @@
+"""Deterministic synthetic dataset shaped like production, for load tests and benchmarks.
+
+Scale 1.0 is about a million users with power-law follower counts, up to three years of
+logins each and attempts spread over every seed course. The same seed and scale always
+give the same documents, ids and timestamps, in every layout:
+
+  current     what the app reads today: users with a capped login_history, counters and
+              course_stats, plus the quiz_attempts and follows collections
+  embedded    the original schema: full login_history, quiz_accuracy and follower/following
+              username arrays on each user (the startup migrations convert it to current;
+              generating it clears their completion markers so they run again)
+  normalized  current, with the full login history in a logins collection, one document
+              per login, instead of on the user
+
+Every user's password is PASSWORD. Courses are inserted from the seed files when the
+database has none; feeds are left to the fan-out.
+
+Run from the server directory:
+    python -m loadtest.dataset [--scale S] [--layout L] [--seed N] [--drop] [--in-memory]
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "loadtest-secret")
+
+import numpy as np
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from auth import BCRYPT_ROUNDS, pwd_context
+from database import MIGRATIONS, migration_meta_id
+from grading import GradingPlan
+from models.course import with_slug
+from routes.user import LOGIN_HISTORY_LIMIT
+from seed import load_initial_courses
+
+LAYOUTS = ("current", "embedded", "normalized")
+USERS_AT_SCALE_1 = 1_000_000
+NOW = datetime(2024, 6, 1)
+HISTORY_DAYS = 3 * 365
+# Follower counts are Lomax (Pareto II) distributed: FOLLOWER_SCALE / (FOLLOWER_SHAPE - 1) = 10
+# followers on average, with a tail reaching the most followed accounts
+FOLLOWER_SHAPE = 1.2
+FOLLOWER_SCALE = 2.0
+MEAN_ATTEMPTS = 20
+BATCH_SIZE = 1000
+PASSWORD = "learnxr-password"
+# Fixed salt so the generated hash is identical across runs
+PASSWORD_SALT = "LearnXRsyntheticdata.O"
+
+def object_id(kind: int, index: int) -> ObjectId:
+    """Deterministic ObjectId: NOW's timestamp, then a kind byte and the index"""
+    return ObjectId(f"{int(NOW.timestamp()):08x}{kind:02x}{index:014x}")
+
+def follow_graph(rng, users: int):
+    """(follower, followee) index arrays without self-follows or duplicates"""
+    followers_wanted = np.minimum(
+        np.floor(rng.pareto(FOLLOWER_SHAPE, users) * FOLLOWER_SCALE).astype(np.int64),
+        users - 1
+    )
+    followee = np.repeat(np.arange(users, dtype=np.int64), followers_wanted)
+    # Uniform over everyone except the followee
+    follower = rng.integers(0, max(users - 1, 1), followee.size, dtype=np.int64)
+    follower += follower >= followee
+    edges = np.unique(follower * users + followee)
+    return edges // users, edges % users
+
+def login_days(rng, age_days: int) -> np.ndarray:
+    """Sorted day offsets (0 = account creation) on which the user logged in"""
+    activity = rng.beta(0.8, 3.0)
+    count = min(age_days, max(1, rng.binomial(age_days, activity)))
+    return np.sort(rng.choice(age_days, count, replace=False))
+
+def streaks(days: np.ndarray) -> np.ndarray:
+    """Streak count at each login, i.e. its position in its run of consecutive days"""
+    positions = np.arange(days.size)
+    run_starts = np.concatenate(([True], np.diff(days) != 1))
+    return positions - np.maximum.accumulate(np.where(run_starts, positions, 0)) + 1
+
+def attempts_for(rng, user_id: str, created_at: datetime, courses: list) -> list:
+    """Quiz attempts as stored in quiz_attempts; scores follow a per-user skill level"""
+    skill = rng.beta(4.0, 2.0)
+    age_seconds = max(1, int((NOW - created_at).total_seconds()))
+    count = rng.geometric(1 / (MEAN_ATTEMPTS + 1)) - 1
+    offsets = np.sort(rng.integers(0, age_seconds, count))
+    attempts = []
+    for offset in offsets:
+        course_id, title, key = courses[rng.integers(len(courses))]
+        correct = rng.random(key.size) < skill
+        selected = np.where(correct, key, (key + rng.integers(1, 4, key.size)) % 4)
+        attempts.append({
+            "_id": str(uuid.UUID(bytes=rng.bytes(16), version=4)),
+            "user_id": user_id,
+            "course_id": course_id,
+            "quiz_id": course_id,
+            "course_title": title,
+            "score": float(correct.mean() * 100) if key.size else 0.0,
+            "answers": {str(index): int(option) for index, option in enumerate(selected)},
+            "submitted_at": created_at + timedelta(seconds=int(offset))
+        })
+    return attempts
+
+def quiz_stats(attempts: list) -> dict:
+    """The fields quiz_stats_update maintains, folded from a user's attempts"""
+    if not attempts:
+        return {}
+    course_stats = {}
+    for attempt in attempts:
+        stats = course_stats.setdefault(attempt["course_id"], {
+            "course_title": attempt["course_title"], "attempts": 0, "score_sum": 0.0, "best_score": 0.0
+        })
+        stats["attempts"] += 1
+        stats["score_sum"] += attempt["score"]
+        stats["best_score"] = max(stats["best_score"], attempt["score"])
+        stats["last_score"] = attempt["score"]
+        stats["last_submitted_at"] = attempt["submitted_at"]
+    for stats in course_stats.values():
+        stats["average_score"] = stats["score_sum"] / stats["attempts"]
+    score_sum = sum(attempt["score"] for attempt in attempts)
+    return {
+        "score_sum": score_sum,
+        "total_quizzes_completed": len(attempts),
+        "average_score": score_sum / len(attempts),
+        "course_stats": course_stats
+    }
+
+def documents(seed: int, users: int, layout: str, courses: list):
+    """Yield (collection, document) pairs in insertion order"""
+    rng = np.random.default_rng(seed)
+    password = pwd_context.handler("bcrypt").using(rounds=BCRYPT_ROUNDS, salt=PASSWORD_SALT).hash(PASSWORD)
+    follower, followee = follow_graph(rng, users)
+    followers_count = np.bincount(followee, minlength=users)
+    following_count = np.bincount(follower, minlength=users)
+    created_offsets = rng.integers(1, HISTORY_DAYS, users)
+    # Each follow happens after both accounts exist
+    follow_ages = rng.random(follower.size) * np.minimum(created_offsets[follower], created_offsets[followee])
+
+    if layout == "embedded":
+        # Username arrays on both sides of each follow, sliced from the sorted edge lists
+        by_follower = np.argsort(follower, kind="stable")
+        by_followee = np.argsort(followee, kind="stable")
+        following_starts = np.concatenate(([0], np.cumsum(following_count)))
+        followers_starts = np.concatenate(([0], np.cumsum(followers_count)))
+
+    for index in range(users):
+        user_id = object_id(1, index)
+        age_days = int(created_offsets[index])
+        created_at = NOW - timedelta(days=age_days)
+        days = login_days(rng, age_days)
+        counts = streaks(days)
+        seconds = rng.integers(0, 86400, days.size)
+        history = [
+            {"date": created_at + timedelta(days=int(day), seconds=int(second)), "streak_count": int(count)}
+            for day, second, count in zip(days, seconds, counts)
+        ]
+        attempts = attempts_for(rng, str(user_id), created_at, courses)
+
+        user = {
+            "_id": user_id,
+            "username": f"user{index}",
+            "email": f"user{index}@example.com",
+            "password": password,
+            "created_at": created_at,
+            "updated_at": history[-1]["date"],
+            "role": "Student",
+            "about": "",
+            "current_streak": int(counts[-1]),
+            "longest_streak": int(counts.max()),
+            "last_login": history[-1]["date"]
+        }
+        if layout == "embedded":
+            user["login_history"] = history
+            user["quiz_accuracy"] = [{
+                "id": attempt["_id"],
+                "quiz_id": attempt["quiz_id"],
+                "course_title": attempt["course_title"],
+                "score": attempt["score"],
+                "answers": attempt["answers"],
+                "submitted_at": attempt["submitted_at"]
+            } for attempt in attempts]
+            if attempts:
+                stats = quiz_stats(attempts)
+                user["total_quizzes_completed"] = stats["total_quizzes_completed"]
+                user["average_score"] = stats["average_score"]
+            user["following"] = [f"user{other}" for other in followee[by_follower[following_starts[index]:following_starts[index + 1]]]]
+            user["followers"] = [f"user{other}" for other in follower[by_followee[followers_starts[index]:followers_starts[index + 1]]]]
+        else:
+            user["login_history"] = history[-LOGIN_HISTORY_LIMIT:] if layout == "current" else []
+            user["followers_count"] = int(followers_count[index])
+            user["following_count"] = int(following_count[index])
+            user.update(quiz_stats(attempts))
+        yield "users", user
+
+        if layout != "embedded":
+            for attempt in attempts:
+                yield "quiz_attempts", attempt
+        if layout == "normalized":
+            for entry in history:
+                yield "logins", {"user_id": str(user_id), **entry}
+
+    if layout != "embedded":
+        for index, (source, target) in enumerate(zip(follower, followee)):
+            yield "follows", {
+                "_id": object_id(2, index),
+                "follower_id": str(object_id(1, int(source))),
+                "followee_id": str(object_id(1, int(target))),
+                "created_at": NOW - timedelta(days=float(follow_ages[index]))
+            }
+
+async def ensure_courses(db) -> list:
+    """(course_id, title, answer key) for every course, inserting the seed courses if there are none"""
+    courses = await db.courses.find({}, {"title": 1, "lessons": 1}).to_list(length=None)
+    if not courses:
+        courses = [{"_id": object_id(0, index), **with_slug(course)} for index, course in enumerate(load_initial_courses())]
+        await db.courses.insert_many(courses)
+    plans = [GradingPlan(course) for course in courses]
+    return [(plan.course_id, plan.course_title, np.array(plan.correct_answers, dtype=np.int64)) for plan in plans]
+
+async def generate(db, scale: float = 0.01, layout: str = "current", seed: int = 0, batch_size: int = BATCH_SIZE, drop: bool = False) -> dict:
+    """Stream the dataset into db with batched insert_many; returns document counts per collection"""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout}, expected one of {', '.join(LAYOUTS)}")
+    if drop:
+        for collection in ("users", "quiz_attempts", "follows", "logins", "feeds"):
+            await db[collection].drop()
+
+    if layout == "embedded":
+        # Let the next start run the migrations over the embedded fields again
+        await db.meta.delete_many({"_id": {"$in": [migration_meta_id(name) for name in MIGRATIONS]}})
+
+    courses = await ensure_courses(db)
+    users = max(2, int(USERS_AT_SCALE_1 * scale))
+    batches = {}
+    counts = {}
+    for collection, document in documents(seed, users, layout, courses):
+        batch = batches.setdefault(collection, [])
+        batch.append(document)
+        if len(batch) >= batch_size:
+            await db[collection].insert_many(batch, ordered=False)
+            counts[collection] = counts.get(collection, 0) + len(batch)
+            batch.clear()
+    for collection, batch in batches.items():
+        if batch:
+            await db[collection].insert_many(batch, ordered=False)
+            counts[collection] = counts.get(collection, 0) + len(batch)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m loadtest.dataset", description="Generate a synthetic dataset")
+    parser.add_argument("--scale", type=float, default=0.01, help="1.0 is about a million users (default 0.01)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="current")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--drop", action="store_true", help="drop the generated collections first")
+    parser.add_argument("--in-memory", action="store_true", help="generate into the in-memory stand-in, e.g. to time generation")
+    args = parser.parse_args()
+
+    if args.in_memory:
+        from loadtest.backend import InMemoryClient
+        client = InMemoryClient()
+    else:
+        client = AsyncIOMotorClient(os.environ["MONGODB_URL"])
+
+    started = time.perf_counter()
+    counts = asyncio.run(generate(client.learnxr, args.scale, args.layout, args.seed, args.batch_size, args.drop))
+    elapsed = time.perf_counter() - started
+    for collection, count in counts.items():
+        print(f"{collection:<14} {count:>10}")
+    print(f"Generated {args.layout} layout at scale {args.scale:g} in {elapsed:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "loadtest-secret")
+# Per-request INFO lines would dominate the timings
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+import database
+import main
+from roundtrips import parse_server_timing
+from loadtest.backend import InMemoryClient
+from loadtest.scenarios import SCENARIOS, Context
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+class Recorder:
+    """Client-side latency, status and Mongo round trips for each named request"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.round_trips: Dict[str, List[int]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def timed(self, name: str, request):
+        started = time.perf_counter()
+        response = await request
+        self.latencies[name].append(time.perf_counter() - started)
+        self.statuses[name][response.status_code] += 1
+        server_timing = response.headers.get("Server-Timing")
+        if server_timing:
+            self.round_trips[name].append(parse_server_timing(server_timing)[0])
+        return response
+
+    def summary(self, elapsed: float) -> dict:
+        all_latencies = sorted(latency for latencies in self.latencies.values() for latency in latencies)
+        return {
+            "requests": len(all_latencies),
+            "errors": sum(count for statuses in self.statuses.values() for status, count in statuses.items() if status >= 500),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(all_latencies) / elapsed, 1) if elapsed else 0.0,
+            **_latency_summary(all_latencies),
+            "endpoints": {
+                name: {
+                    "requests": len(latencies),
+                    "statuses": {str(status): count for status, count in sorted(self.statuses[name].items())},
+                    "round_trips_mean": round(sum(self.round_trips[name]) / len(self.round_trips[name]), 2) if self.round_trips[name] else None,
+                    "round_trips_max": max(self.round_trips[name], default=None),
+                    **_latency_summary(sorted(latencies))
+                }
+                for name, latencies in sorted(self.latencies.items())
+            }
+        }
+
+def _latency_summary(sorted_latencies: List[float]) -> dict:
+    return {
+        f"{label}_ms": round(percentile(sorted_latencies, q) * 1000, 2)
+        for label, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+    }
+
+async def run_scenario(name: str, http, concurrency: int, iterations: int, seed: int) -> dict:
+    """Run one scenario with `concurrency` workers, each doing `iterations` steps"""
+    recorder = Recorder()
+    context = Context(name, http, await database.get_database(), recorder, seed)
+    scenario = SCENARIOS[name]()
+    await scenario.setup(context)
+
+    async def worker(index: int):
+        for iteration in range(iterations):
+            await scenario.step(context, index, iteration)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(index) for index in range(concurrency)])
+    return recorder.summary(time.perf_counter() - started)
+
+async def run(scenarios: List[str], concurrency: int = 10, iterations: int = 20, latency_ms: float = 0.0, seed: int = 0) -> dict:
+    """Start the app against a fresh in-memory database and run each scenario in turn"""
+    await database.connect(InMemoryClient(latency_ms))
+    results = {}
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as http:
+            for name in scenarios:
+                results[name] = await run_scenario(name, http, concurrency, iterations, seed)
+    return {
+        "config": {"concurrency": concurrency, "iterations": iterations, "latency_ms": latency_ms, "seed": seed},
+        "scenarios": results
+    }
@@ -0,0 +1,123 @@
+import random
+from datetime import datetime
+from auth import create_access_token, get_password_hash
+from grading import GradingPlan
+
+PASSWORD = "loadtest-password"
+
+class Context:
+    """State shared by a scenario's workers: the HTTP client, seeded users and courses"""
+
+    def __init__(self, name: str, http, db, recorder, seed: int):
+        self.name = name
+        self.http = http
+        self.db = db
+        self.recorder = recorder
+        self.random = random.Random(seed)
+        self.users = []  # {"username", "email", "token"}
+        self.courses = []  # (course_id, total_questions)
+
+    async def request(self, name: str, method: str, url: str, user: dict = None, **kwargs):
+        if user:
+            kwargs["headers"] = {"Authorization": f"Bearer {user['token']}"}
+        return await self.recorder.timed(name, self.http.request(method, url, **kwargs))
+
+    def user(self) -> dict:
+        return self.random.choice(self.users)
+
+async def seed_users(context: Context, count: int):
+    """Insert users directly, sharing one password hash so setup stays cheap"""
+    password_hash = get_password_hash(PASSWORD)
+    now = datetime.utcnow()
+    offset = len(context.users)
+    docs = [{
+        "username": f"{context.name}{offset + index}",
+        "email": f"{context.name}{offset + index}@example.com",
+        "password": password_hash,
+        "created_at": now,
+        "updated_at": now,
+        "followers_count": 0,
+        "following_count": 0,
+        "current_streak": 0,
+        "longest_streak": 0,
+        "last_login": None,
+        "login_history": []
+    } for index in range(count)]
+    result = await context.db.users.insert_many(docs)
+    for doc, user_id in zip(docs, result.inserted_ids):
+        context.users.append({
+            "username": doc["username"],
+            "email": doc["email"],
+            "token": create_access_token({"sub": str(user_id)})
+        })
+
+async def load_courses(context: Context):
+    response = await context.http.get("/api/courses")
+    response.raise_for_status()
+    context.courses = [(course["_id"], GradingPlan(course).total_questions) for course in response.json()]
+
+class Scenario:
+    users = 20
+
+    async def setup(self, context: Context):
+        if self.users:
+            await seed_users(context, self.users)
+
+    async def step(self, context: Context, worker: int, iteration: int):
+        raise NotImplementedError
+
+class Signup(Scenario):
+    users = 0
+
+    async def step(self, context, worker, iteration):
+        username = f"{context.name}{worker}x{iteration}"
+        await context.request("signup", "POST", "/api/users/", json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": PASSWORD
+        })
+
+class LoginStorm(Scenario):
+    async def step(self, context, worker, iteration):
+        user = context.user()
+        await context.request("login", "POST", "/api/users/login", json={"email": user["email"], "password": PASSWORD})
+
+class Dashboard(Scenario):
+    """What the dashboard page requests after sign-in"""
+
+    async def step(self, context, worker, iteration):
+        user = context.user()
+        await context.request("me", "GET", "/api/users/me", user=user)
+        await context.request("courses", "GET", "/api/courses")
+        await context.request("recent_quizzes", "GET", f"/api/quizzes/recent/{user['username']}")
+        await context.request("quiz_accuracy", "GET", f"/api/quizzes/accuracy/{user['username']}")
+        await context.request("leaderboard", "GET", "/api/leaderboards/average_score")
+        await context.request("feed", "GET", "/api/users/me/feed", user=user)
+
+class QuizBurst(Scenario):
+    async def setup(self, context):
+        await super().setup(context)
+        await load_courses(context)
+
+    async def step(self, context, worker, iteration):
+        course_id, total_questions = context.random.choice(context.courses)
+        answers = {str(index): context.random.randrange(4) for index in range(total_questions)}
+        await context.request("submit_quiz", "POST", f"/api/quizzes/{course_id}/submit", user=context.user(), json={"answers": answers})
+
+class FollowChurn(Scenario):
+    async def step(self, context, worker, iteration):
+        # Each worker follows from its own user so follow/unfollow pairs don't interleave
+        follower = context.users[worker % len(context.users)]
+        followee = context.user()
+        if followee is follower:
+            return
+        await context.request("follow", "POST", f"/api/users/username/{followee['username']}/follow", user=follower)
+        await context.request("unfollow", "POST", f"/api/users/username/{followee['username']}/unfollow", user=follower)
+
+SCENARIOS = {
+    "signup": Signup,
+    "login_storm": LoginStorm,
+    "dashboard": Dashboard,
+    "quiz_burst": QuizBurst,
+    "follow_churn": FollowChurn
+}
@@ -0,0 +1,32 @@
+import asyncio
+import os
+
+# Cheap hashes keep the signup and login scenarios fast; set before auth is imported
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from loadtest.runner import run
+from loadtest.scenarios import SCENARIOS
+
+# Most Mongo round trips each scenario request may make; catches N+1 regressions
+ROUND_TRIP_BUDGETS = {
+    "signup": 1,
+    "login": 4,
+    "me": 2,
+    "courses": 1,
+    "recent_quizzes": 2,
+    "quiz_accuracy": 2,
+    "leaderboard": 0,
+    "feed": 2,
+    "submit_quiz": 3,
+    "follow": 5,
+    "unfollow": 4
+}
+
+def test_scenarios():
+    results = asyncio.run(run(list(SCENARIOS), concurrency=2, iterations=3))
+    for name, result in results["scenarios"].items():
+        assert result["errors"] == 0, f"{name}: {result['endpoints']}"
+        for endpoint, stats in result["endpoints"].items():
+            assert stats["round_trips_max"] <= ROUND_TRIP_BUDGETS[endpoint], (
+                f"{endpoint} made {stats['round_trips_max']} Mongo round trips, budget is {ROUND_TRIP_BUDGETS[endpoint]}"
+            )
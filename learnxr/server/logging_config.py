@@ -0,0 +1,121 @@
+import atexit
+import logging
+import os
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+# LOG_LEVEL sets the default; LOG_LEVELS overrides it per logger, e.g.
+#   LOG_LEVELS="routes.quizzes=WARNING,routes.quizzes.answers=DEBUG"
+# LOG_SAMPLE_RATES keeps only a fraction of a logger's records, e.g.
+#   LOG_SAMPLE_RATES="routes.quizzes.answers=0.01"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+class LogFields:
+    """A message with key=value fields that is only formatted if the record is emitted.
+
+    Formatting happens on the listener thread, so pass values that won't change afterwards.
+    Callable values are called at format time, for fields that are costly to build.
+    """
+    __slots__ = ("message", "fields")
+
+    def __init__(self, message: str, **fields):
+        self.message = message
+        self.fields = fields
+
+    def __str__(self):
+        if not self.fields:
+            return self.message
+        return self.message + " " + " ".join(
+            f"{key}={value() if callable(value) else value}" for key, value in self.fields.items()
+        )
+
+class SamplingFilter(logging.Filter):
+    """Let through a random fraction of records"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return self.rate >= 1 or random.random() < self.rate
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the listener thread without formatting or blocking the caller.
+
+    When the queue is full the record is dropped and counted rather than stalling the event loop.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The listener formats the record; the queue never leaves the process
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_queue_handler = None
+_listener = None
+_output_handlers = []
+
+def _parse_pairs(value: str) -> dict:
+    pairs = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, setting = item.split("=", 1)
+            pairs[name.strip()] = setting.strip()
+    return pairs
+
+def _start_listener():
+    """(Re)start the listener thread; threads don't survive a fork, so workers start their own"""
+    global _listener
+    _queue_handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _listener = QueueListener(_queue_handler.queue, *_output_handlers, respect_handler_level=True)
+    _listener.start()
+
+def stop():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler else 0
+
+def configure_logging(stream=None):
+    """Route all logging through a queue to a listener thread. Safe to call more than once."""
+    global _queue_handler, _output_handlers
+    if _queue_handler is not None:
+        return
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    _output_handlers = [output]
+    _queue_handler = NonBlockingQueueHandler(None)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+    for name, level in _parse_pairs(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level.upper())
+    for name, rate in _parse_pairs(LOG_SAMPLE_RATES).items():
+        logging.getLogger(name).addFilter(SamplingFilter(float(rate)))
+
+    _start_listener()
+    os.register_at_fork(after_in_child=_start_listener)
+    atexit.register(stop)
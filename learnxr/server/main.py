@@ -1,14 +1,58 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from routes.user import router as user_router
 from routes.courses import router as courses_router
 from routes.quizzes import router as quizzes_router
-from database import initialize_courses
+from routes.leaderboards import router as leaderboards_router
+from serialization import MongoJSONResponse
+from auth import shutdown_password_hash_pool, password_hash_pool_stats
+from database import get_database, initialize_courses, backfill_course_slugs, remove_duplicate_quizzes, ensure_indexes, UNIQUE_INDEX_COLLECTIONS, log_index_report, migrate_quiz_attempts, migrate_follow_edges
+import database
+import leaderboard
+import lifecycle
+import metrics
+import logging_config
+from logging_config import configure_logging
 import logging
 
+configure_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The load-test harness connects its own in-memory client before startup
+    if database.client is None:
+        await database.connect()
+    try:
+        # Slugs and the unique slug index must exist before seeding upserts by slug
+        await backfill_course_slugs()
+        await remove_duplicate_quizzes()
+        failed = [collection for collection in await ensure_indexes() if collection in UNIQUE_INDEX_COLLECTIONS]
+        if failed:
+            raise RuntimeError(f"Unique indexes missing on {', '.join(failed)}; remove the duplicates and restart")
+        await initialize_courses()
+        await migrate_quiz_attempts()
+        await migrate_follow_edges()
+        await leaderboard.rebuild(await get_database())
+        await log_index_report()
+        await lifecycle.warmup(await get_database())
+    except Exception as e:
+        # Never report ready after a partial startup; the worker exits and is restarted instead
+        logger.error(f"Startup failed: {str(e)}")
+        database.close()
+        raise
+    # Requests only read the boards; reconciling them with other workers' writes happens here
+    leaderboard_refresh = asyncio.create_task(leaderboard.refresh_periodically(await get_database()))
+    lifecycle.mark_ready()
+    yield
+    lifecycle.start_draining()
+    leaderboard_refresh.cancel()
+    shutdown_password_hash_pool()
+    database.close()
+
+app = FastAPI(default_response_class=MongoJSONResponse, lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -19,18 +63,43 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["*"]
 )
+# Added last so it wraps CORS too and times the whole request
+app.add_middleware(metrics.MetricsMiddleware, root_app=app)
 
 # Include routers
 app.include_router(user_router, prefix="/api/users", tags=["users"])
 app.include_router(courses_router, prefix="/api", tags=["courses"])
 app.include_router(quizzes_router, prefix="/api", tags=["quizzes"])
+app.include_router(leaderboards_router, prefix="/api", tags=["leaderboards"])
 
-@app.on_event("startup")
-async def startup_event():
-    try:
-        await initialize_courses()
-    except Exception as e:
-        logger.error(f"Failed to initialize courses: {str(e)}")
+@app.get("/ready")
+async def ready(response: Response):
+    # Load balancers should only route to workers that have warmed up and aren't draining
+    if not lifecycle.is_ready():
+        response.status_code = 503
+    return {"status": lifecycle.state()}
+
+@app.get("/debug/pool")
+async def debug_pool():
+    return database.pool_metrics.stats()
+
+@app.get("/metrics")
+async def get_metrics():
+    pool = database.pool_metrics.stats()
+    hashing = password_hash_pool_stats()
+    gauges = {
+        "mongo_pool_connections_open": ("Open connections in the Mongo pool", pool["connections_open"]),
+        "mongo_pool_connections_in_use": ("Checked out Mongo connections", pool["connections_in_use"]),
+        "mongo_pool_checkout_failures": ("Failed Mongo connection checkouts", pool["checkout_failures"]),
+        "mongo_pool_wait_p99_seconds": ("99th percentile wait for a Mongo connection", pool["checkout_wait_seconds_p99"]),
+        "password_hash_queue_depth": ("Password hashes waiting for a worker", hashing["queue_depth"]),
+        "password_hash_in_flight": ("Password hashes being computed", hashing["in_flight"]),
+        "password_hash_rejected": ("Password hashes rejected because the queue was full", hashing["rejected"]),
+        "password_hash_completed": ("Password hashes computed", hashing["completed"]),
+        "password_hash_failed": ("Password hashes that raised or were cancelled", hashing["failed"]),
+        "log_records_dropped": ("Log records dropped because the queue was full", logging_config.dropped_records())
+    }
+    return Response(metrics.render(gauges), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 async def root():
@@ -0,0 +1,234 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional, Tuple
+import bson
+from pymongo import monitoring
+from starlette.datastructures import MutableHeaders
+import roundtrips
+
+# Upper bounds in seconds, shared by request and Mongo command timings
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+class Histogram:
+    """Fixed-bucket latency histogram; quantiles are interpolated within buckets"""
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return BUCKETS[-1]
+
+class Registry:
+    """Histograms and counters keyed by label tuples. Updates may come from Motor's executor threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, Dict[Tuple, Histogram]] = {}
+        self.counters: Dict[str, Dict[Tuple, int]] = {}
+
+    def observe(self, name: str, labels: Tuple, seconds: float):
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name: str, labels: Tuple, amount: int = 1):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+
+registry = Registry()
+in_flight = 0
+
+REQUEST_LABELS = ("method", "route")
+STATUS_LABELS = ("method", "route", "status")
+COMMAND_LABELS = ("command", "collection")
+
+_route_paths: Dict[int, str] = {}
+
+def _route_template(app, scope) -> str:
+    """The matched route's path template, so /api/courses/{course_title} is one series"""
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    path = _route_paths.get(id(endpoint))
+    if path is None:
+        for route in app.router.routes:
+            if getattr(route, "endpoint", None) is endpoint:
+                path = _route_paths[id(endpoint)] = route.path
+                break
+        else:
+            return "unmatched"
+    return path
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request until its last body chunk is sent.
+
+    Background tasks run after that point and are not counted in the request's latency.
+    """
+
+    def __init__(self, app, root_app=None):
+        self.app = app
+        self.root_app = root_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global in_flight
+        in_flight += 1
+        round_trips = roundtrips.start()
+        started = time.perf_counter()
+        status = 500
+        finished = False
+
+        def record():
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            global in_flight
+            in_flight -= 1
+            labels = (scope["method"], _route_template(self.root_app or scope["app"], scope))
+            registry.observe("http_request_duration_seconds", labels, time.perf_counter() - started)
+            registry.increment("http_responses_total", labels + (str(status),))
+
+        async def timed_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", round_trips.server_timing())
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            record()
+
+def observe_command(command: str, collection: str, seconds: float, reply_bytes: int = 0, failed: bool = False):
+    """Record one Mongo round trip, globally and against the current request"""
+    labels = (command, collection)
+    registry.observe("mongo_command_duration_seconds", labels, seconds)
+    if failed:
+        registry.increment("mongo_command_failures_total", labels)
+    roundtrips.record(command, collection, seconds, reply_bytes)
+
+class CommandMetrics(monitoring.CommandListener):
+    """Times every Mongo command by command name and collection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections: Dict[Tuple, str] = {}
+
+    @staticmethod
+    def _key(event) -> Tuple:
+        return (event.request_id, event.connection_id)
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        with self._lock:
+            self._collections[self._key(event)] = target if isinstance(target, str) else ""
+
+    def _finish(self, event) -> Tuple:
+        with self._lock:
+            collection = self._collections.pop(self._key(event), "")
+        return (event.command_name, collection)
+
+    def succeeded(self, event):
+        reply_bytes = 0
+        if roundtrips.current() is not None:
+            # pymongo only hands over the decoded reply, so its size is re-encoded here.
+            # Only done inside requests; startup scans of whole collections are skipped.
+            reply_bytes = len(bson.encode(event.reply))
+        observe_command(*self._finish(event), event.duration_micros / 1e6, reply_bytes)
+
+    def failed(self, event):
+        observe_command(*self._finish(event), event.duration_micros / 1e6, failed=True)
+
+command_metrics = CommandMetrics()
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names: Iterable[str], values: Tuple, extra: Optional[dict] = None) -> str:
+    pairs = list(zip(names, values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _render_histogram(lines: list, name: str, label_names: Tuple, series: Dict[Tuple, Histogram], help_text: str):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in sorted(series.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS + (float("inf"),), histogram.counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_labels(label_names, labels, {'le': le})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(label_names, labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(label_names, labels)} {histogram.count}")
+
+    quantile_name = name.replace("_seconds", "_quantile_seconds")
+    lines.append(f"# HELP {quantile_name} {help_text}, estimated quantiles")
+    lines.append(f"# TYPE {quantile_name} gauge")
+    for labels, histogram in sorted(series.items()):
+        for q in QUANTILES:
+            lines.append(f"{quantile_name}{_labels(label_names, labels, {'quantile': q})} {histogram.quantile(q)}")
+
+def _render_counter(lines: list, name: str, label_names: Tuple, series: Dict[Tuple, int], help_text: str):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in sorted(series.items()):
+        lines.append(f"{name}{_labels(label_names, labels)} {value}")
+
+def render(gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+    """Everything in Prometheus text exposition format; gauges maps name -> (help, value)"""
+    with registry._lock:
+        histograms = {name: dict(series) for name, series in registry.histograms.items()}
+        counters = {name: dict(series) for name, series in registry.counters.items()}
+
+    lines = [
+        "# HELP http_requests_in_flight Requests currently being handled by this worker",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {in_flight}"
+    ]
+    _render_histogram(lines, "http_request_duration_seconds", REQUEST_LABELS,
+                      histograms.get("http_request_duration_seconds", {}), "Request latency by route")
+    _render_counter(lines, "http_responses_total", STATUS_LABELS,
+                    counters.get("http_responses_total", {}), "Responses by route and status code")
+    _render_histogram(lines, "mongo_command_duration_seconds", COMMAND_LABELS,
+                      histograms.get("mongo_command_duration_seconds", {}), "Mongo command latency by command and collection")
+    _render_counter(lines, "mongo_command_failures_total", COMMAND_LABELS,
+                    counters.get("mongo_command_failures_total", {}), "Failed Mongo commands by command and collection")
+    for name, (help_text, value) in (gauges or {}).items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
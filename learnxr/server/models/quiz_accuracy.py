@@ -6,11 +6,18 @@ import uuid
 class QuizAccuracy(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
+    course_id: str
     quiz_id: str
     course_title: str
     score: float
-    answers: Dict[str, str]
+    answers: Dict[str, int]
     submitted_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+    def to_document(self) -> dict:
+        """Attempts are stored in quiz_attempts with their id as _id"""
+        document = self.dict(exclude={"id"})
+        document["_id"] = self.id
+        return document
@@ -1,22 +1,8 @@
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 import uuid
 
-class QuizAccuracy(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    quiz_id: str
-    course_title: str
-    score: float
-    answers: Dict[str, str]
-    submitted_at: datetime = Field(default_factory=datetime.utcnow)
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        populate_by_name = True
-
 class LoginHistory(BaseModel):
     date: datetime
     streak_count: int
@@ -32,13 +18,12 @@ class User(BaseModel):
     email: EmailStr
     password: str
     about: Optional[str] = None
-    followers: List[str] = []
-    following: List[str] = []
     followers_count: int = 0
     following_count: int = 0
-    quiz_accuracy: List[QuizAccuracy] = []
     total_quizzes_completed: int = 0
+    score_sum: float = 0.0
     average_score: float = 0.0
+    course_stats: Dict[str, Dict[str, Any]] = {}
     login_history: List[LoginHistory] = []
     current_streak: int = 0
     longest_streak: int = 0
@@ -65,8 +50,6 @@ class UserResponse(BaseModel):
     last_login: Optional[datetime] = None
     role: str = "Student"
     about: str = ""
-    followers: List[str] = []
-    following: List[str] = []
     followers_count: int = 0
     following_count: int = 0
     created_at: datetime
@@ -78,9 +61,12 @@ class UserProfileResponse(BaseModel):
     role: str = "Student"
     joined_date: datetime
     about: str = ""
-    followers: List[str]
-    following: List[str]
     followers_count: int
     following_count: int
     current_streak: int = 0
-    longest_streak: int = 0 
\ No newline at end of file
+    longest_streak: int = 0
+
+class FollowEdge(BaseModel):
+    follower_id: str
+    followee_id: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,20 @@
+import base64
+from bson import json_util
+from bson.json_util import CANONICAL_JSON_OPTIONS
+from fastapi import HTTPException
+
+def encode_cursor(*values) -> str:
+    """Encode the sort key of the last item on a page into an opaque cursor"""
+    raw = json_util.dumps(list(values), json_options=CANONICAL_JSON_OPTIONS)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Decode a cursor produced by encode_cursor, rejecting anything malformed with a 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json_util.loads(raw)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
@@ -0,0 +1,66 @@
+import re
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+# Round trips made while handling the current request. Motor runs each operation in an
+# executor thread with a copy of the caller's context, so the command listener sees the
+# same RoundTrips object as the handler that issued the command.
+_current: ContextVar[Optional["RoundTrips"]] = ContextVar("round_trips", default=None)
+
+class RoundTrips:
+    """Mongo commands issued for one request, as (command, collection, seconds, reply bytes)"""
+    __slots__ = ("commands",)
+
+    def __init__(self):
+        # Appends are atomic, so commands finishing on different executor threads need no lock
+        self.commands: List[Tuple[str, str, float, int]] = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.commands)
+
+    @property
+    def seconds(self) -> float:
+        return sum(command[2] for command in self.commands)
+
+    @property
+    def bytes(self) -> int:
+        return sum(command[3] for command in self.commands)
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.calls} calls, {self.bytes} bytes"'
+
+def start() -> RoundTrips:
+    """Begin counting for the current request; call from the task that runs the handler"""
+    round_trips = RoundTrips()
+    _current.set(round_trips)
+    return round_trips
+
+def current() -> Optional[RoundTrips]:
+    return _current.get()
+
+def record(command: str, collection: str, seconds: float, reply_bytes: int = 0):
+    round_trips = _current.get()
+    if round_trips is not None:
+        round_trips.commands.append((command, collection, seconds, reply_bytes))
+
+_SERVER_TIMING = re.compile(r'db;dur=([\d.]+);desc="(\d+) calls, (\d+) bytes"')
+
+def parse_server_timing(header: str) -> Tuple[int, int, float]:
+    """(calls, bytes, milliseconds) from a Server-Timing header set by this server"""
+    match = _SERVER_TIMING.search(header or "")
+    if not match:
+        raise ValueError(f"No db entry in Server-Timing header: {header!r}")
+    return int(match.group(2)), int(match.group(3)), float(match.group(1))
+
+def assert_round_trips(response, budget: int):
+    """Fail if a response took more Mongo round trips than its budget.
+
+    Works with requests, httpx and TestClient responses, e.g.
+        assert_round_trips(client.get("/api/courses"), 1)
+    """
+    calls, reply_bytes, milliseconds = parse_server_timing(response.headers.get("Server-Timing"))
+    assert calls <= budget, (
+        f"{response.request.method} {response.request.url} made {calls} Mongo round trips "
+        f"({reply_bytes} bytes, {milliseconds:.1f} ms), budget is {budget}"
+    )
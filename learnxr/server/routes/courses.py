@@ -1,29 +1,26 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from models.course import Course, INITIAL_COURSES
-from database import get_database
-from bson import ObjectId
+from fastapi import APIRouter, HTTPException, Request, Response
+from models.course import Course, slugify, with_slug
+from seed import load_initial_courses
+from database import get_database, ensure_indexes
+from serialization import MongoJSONResponse
+import catalog
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-def convert_objectid_to_str(obj):
-    if isinstance(obj, dict):
-        return {k: convert_objectid_to_str(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_objectid_to_str(item) for item in obj]
-    elif isinstance(obj, ObjectId):
-        return str(obj)
-    return obj
-
 @router.get("/courses")
-async def get_courses():
+async def get_courses(request: Request):
     try:
         db = await get_database()
-        courses = await db.courses.find().to_list(length=None)
-        logger.info(f"Retrieved {len(courses)} courses")
-        return convert_objectid_to_str(courses)
+        etag, body = await catalog.get_catalog(db)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        # Client already has this version of the catalog
+        if catalog.etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
     except Exception as e:
         logger.error(f"Error fetching courses: {str(e)}")
         raise HTTPException(status_code=500, detail="Error fetching courses")
@@ -32,40 +29,122 @@ async def get_courses():
 async def get_course(course_title: str):
     try:
         db = await get_database()
-        # Use regex to match the course title case-insensitively
-        course = await db.courses.find_one({"title": {"$regex": f"^{course_title}$", "$options": "i"}})
+        # Titles are matched through their indexed slug, which is case-insensitive
+        course = await db.courses.find_one({"slug": slugify(course_title)})
         if not course:
             raise HTTPException(status_code=404, detail="Course not found")
         
-        # Convert ObjectId to string and ensure all fields are properly formatted
-        course_data = convert_objectid_to_str(course)
-        
         # Ensure lessons are properly formatted
-        if "lessons" in course_data:
-            for lesson in course_data["lessons"]:
+        if "lessons" in course:
+            for lesson in course["lessons"]:
                 if "quiz" in lesson:
                     for question in lesson["quiz"]:
                         # Ensure correct_answer is an integer
                         if isinstance(question.get("correct_answer"), str):
                             question["correct_answer"] = int(question["correct_answer"])
         
-        return course_data
+        return MongoJSONResponse(course)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching course: {str(e)}")
         raise HTTPException(status_code=500, detail="Error fetching course")
 
+@router.get("/courses/{course_title}/outline")
+async def get_course_outline(course_title: str):
+    try:
+        db = await get_database()
+        # Project lesson headers only; lesson bodies are fetched one at a time
+        outlines = await db.courses.aggregate([
+            {"$match": {"slug": slugify(course_title)}},
+            {"$limit": 1},
+            {"$project": {
+                "title": 1,
+                "slug": 1,
+                "description": 1,
+                "category": 1,
+                "difficulty": 1,
+                "lessons": {
+                    "$map": {
+                        "input": {"$ifNull": ["$lessons", []]},
+                        "as": "lesson",
+                        "in": {
+                            "lesson_number": "$$lesson.lesson_number",
+                            "title": "$$lesson.title",
+                            "question_count": {"$size": {"$ifNull": ["$$lesson.quiz", []]}}
+                        }
+                    }
+                }
+            }}
+        ]).to_list(length=1)
+        if not outlines:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        return MongoJSONResponse(outlines[0])
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching course outline: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error fetching course outline")
+
+@router.get("/courses/{course_title}/lessons/{lesson_number}")
+async def get_course_lesson(course_title: str, lesson_number: int):
+    try:
+        db = await get_database()
+        # $elemMatch returns only the requested lesson instead of the whole lessons array
+        course = await db.courses.find_one(
+            {"slug": slugify(course_title), "lessons.lesson_number": lesson_number},
+            {"title": 1, "lessons": {"$elemMatch": {"lesson_number": lesson_number}}}
+        )
+        if not course or not course.get("lessons"):
+            raise HTTPException(status_code=404, detail="Lesson not found")
+
+        lesson = course["lessons"][0]
+        # Answers are graded server-side and never sent to the client
+        for question in lesson.get("quiz") or []:
+            question.pop("correct_answer", None)
+
+        return {
+            "course_id": str(course["_id"]),
+            "course_title": course["title"],
+            **lesson
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching lesson: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error fetching lesson")
+
+@router.get("/courses/{course_title}/analytics")
+async def get_course_analytics(course_title: str):
+    try:
+        db = await get_database()
+        course = await db.courses.find_one(
+            {"slug": slugify(course_title)},
+            {"title": 1, "lessons.lesson_number": 1, "lessons.quiz": 1}
+        )
+        if not course:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        # Imported here so NumPy isn't loaded at worker startup for a rarely used endpoint
+        import analytics
+        return await analytics.get_course_analytics(db, course)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error computing course analytics: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error computing course analytics")
+
 @router.get("/courses/debug")
 async def debug_courses():
     try:
         db = await get_database()
         courses = await db.courses.find().to_list(length=None)
         logger.info(f"Debug: Retrieved {len(courses)} courses")
-        return {
+        return MongoJSONResponse({
             "count": len(courses),
             "courses": courses
-        }
+        })
     except Exception as e:
         logger.error(f"Error in debug route: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -81,7 +160,8 @@ async def initialize_courses():
             return {"message": "Courses already initialized"}
         
         # Insert initial courses
-        result = await db.courses.insert_many(INITIAL_COURSES)
+        result = await db.courses.insert_many([with_slug(course) for course in load_initial_courses()])
+        await catalog.bump_version(db)
         logger.info(f"Initialized {len(result.inserted_ids)} courses")
         return {"message": f"Successfully initialized {len(result.inserted_ids)} courses"}
     except Exception as e:
@@ -94,8 +174,10 @@ async def reinitialize_courses():
         db = await get_database()
         # Drop existing courses
         await db.courses.drop()
+        await ensure_indexes(["courses"])
         # Insert new courses
-        result = await db.courses.insert_many(INITIAL_COURSES)
+        result = await db.courses.insert_many([with_slug(course) for course in load_initial_courses()])
+        await catalog.bump_version(db)
         logger.info(f"Successfully reinitialized {len(result.inserted_ids)} courses")
         return {"message": f"Successfully reinitialized {len(result.inserted_ids)} courses"}
     except Exception as e:
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from database import get_database
+from models.course import slugify
+from auth import get_current_user
+import leaderboard
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def board_entries(board: leaderboard.Leaderboard, limit: int) -> list:
+    return [
+        {"rank": rank, "username": leaderboard.username(user_id), "score": score}
+        for rank, (user_id, score) in enumerate(board.top(limit), start=1)
+    ]
+
+def my_standing(board: leaderboard.Leaderboard, user_id: str) -> dict:
+    return {
+        "rank": board.rank(user_id),
+        "score": board.score(user_id),
+        "total": len(board)
+    }
+
+async def find_course_id(db, course_title: str) -> str:
+    course = await db.courses.find_one({"slug": slugify(course_title)}, {"_id": 1})
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return str(course["_id"])
+
+def get_global_board(metric: str) -> leaderboard.Leaderboard:
+    board = leaderboard.get_board(metric)
+    if board is None:
+        raise HTTPException(status_code=404, detail=f"Unknown leaderboard: {metric}")
+    return board
+
+@router.get("/leaderboards/courses/{course_title}")
+async def get_course_leaderboard(course_title: str, limit: int = Query(10, ge=1, le=100)):
+    try:
+        db = await get_database()
+        course_id = await find_course_id(db, course_title)
+        return {"course_id": course_id, "entries": board_entries(leaderboard.get_course_board(course_id), limit)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching course leaderboard: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/leaderboards/courses/{course_title}/me")
+async def get_my_course_rank(course_title: str, current_user: dict = Depends(get_current_user)):
+    try:
+        db = await get_database()
+        course_id = await find_course_id(db, course_title)
+        return my_standing(leaderboard.get_course_board(course_id), current_user["id"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching course rank: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/leaderboards/{metric}")
+async def get_leaderboard(metric: str, limit: int = Query(10, ge=1, le=100)):
+    board = get_global_board(metric)
+    return {"metric": metric, "entries": board_entries(board, limit)}
+
+@router.get("/leaderboards/{metric}/me")
+async def get_my_rank(metric: str, current_user: dict = Depends(get_current_user)):
+    board = get_global_board(metric)
+    return my_standing(board, current_user["id"])
@@ -1,165 +1,262 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Response
 from typing import List, Optional
 from datetime import datetime
 import uuid
-from models.quiz import Quiz, Question, QuizSubmission, COURSE_QUESTIONS
-from models.course import Course
+from models.quiz import Quiz, Question, QuizSubmission
+from seed import load_course_questions
+from models.course import Course, slugify
 from database import get_database
 import logging
 from bson import ObjectId
-from models.user import QuizAccuracy
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from models.quiz_accuracy import QuizAccuracy
 from auth import get_current_user
+from serialization import dumps
+from grading import get_grading_plan
+from pagination import encode_cursor, decode_cursor
+from feed import fan_out_quiz_completion
+from logging_config import LogFields
+import leaderboard
+import catalog
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
+answer_logger = logging.getLogger(f"{__name__}.answers")
 
-def convert_objectid_to_str(obj):
-    if isinstance(obj, dict):
-        return {k: convert_objectid_to_str(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_objectid_to_str(item) for item in obj]
-    elif isinstance(obj, ObjectId):
-        return str(obj)
-    return obj
+# course slug -> (catalog version, serialized quiz)
+_quizzes = {}
+
+def attempt_response(attempt: dict) -> dict:
+    attempt["id"] = attempt.pop("_id")
+    return attempt
+
+async def find_user_id(db, username: str) -> str:
+    user = await db.users.find_one({"username": username}, {"_id": 1})
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return str(user["_id"])
+
+def describe_answers(plan, answers: dict) -> str:
+    described = []
+    for index, selected in answers.items():
+        index = int(index)
+        if 0 <= index < plan.total_questions:
+            lesson_number, question_index = plan.locate(index)
+            described.append(f"q{index}(lesson {lesson_number} #{question_index}):{selected}/{plan.correct_answers[index]}")
+    return ",".join(described)
+
+def log_answers(plan, answers: dict):
+    """One debug record per submission covering every answer as selected/correct.
+
+    Skipped entirely unless routes.quizzes.answers is at DEBUG; LOG_SAMPLE_RATES can keep a
+    fraction of submissions, and the per-answer text is only built for records that are emitted.
+    """
+    if answer_logger.isEnabledFor(logging.DEBUG):
+        answer_logger.debug(LogFields(
+            "Answers graded",
+            course_id=plan.course_id,
+            answers=lambda: describe_answers(plan, answers)
+        ))
+
+def quiz_stats_update(course_id: str, course_title: str, score: float, submitted_at: datetime) -> list:
+    """Update pipeline that folds one score into the user's overall and per-course stats.
+
+    Sums and counts are incremented server-side and averages derived from them in the same
+    update. Users created before score_sum existed start from average_score * count.
+    """
+    count = {"$ifNull": ["$total_quizzes_completed", 0]}
+    course = f"course_stats.{course_id}"
+    return [
+        {"$set": {
+            "score_sum": {"$add": [
+                {"$ifNull": ["$score_sum", {"$multiply": [{"$ifNull": ["$average_score", 0]}, count]}]},
+                score
+            ]},
+            "total_quizzes_completed": {"$add": [count, 1]},
+            f"{course}.course_title": {"$literal": course_title},
+            f"{course}.attempts": {"$add": [{"$ifNull": [f"${course}.attempts", 0]}, 1]},
+            f"{course}.score_sum": {"$add": [{"$ifNull": [f"${course}.score_sum", 0]}, score]},
+            f"{course}.best_score": {"$max": [f"${course}.best_score", score]},
+            f"{course}.last_score": {"$literal": score},
+            f"{course}.last_submitted_at": {"$literal": submitted_at}
+        }},
+        {"$set": {
+            "average_score": {"$divide": ["$score_sum", "$total_quizzes_completed"]},
+            f"{course}.average_score": {"$divide": [f"${course}.score_sum", f"${course}.attempts"]}
+        }}
+    ]
 
 @router.get("/quizzes/accuracy/{username}")
-async def get_quiz_accuracy(username: str):
+async def get_quiz_accuracy(
+    username: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
+):
     try:
         db = await get_database()
-        # user = await db.users.find_one({"_id": ObjectId(current_user["id"])})
-        user = await db.users.find_one({"username": username})
+        user = await db.users.find_one(
+            {"username": username},
+            {"total_quizzes_completed": 1, "average_score": 1, "course_stats": 1}
+        )
 
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        quiz_accuracy = user.get("quiz_accuracy", [])
-        total_quizzes = user.get("total_quizzes_completed", 0)
-        average_score = user.get("average_score", 0)
+        # Attempts are returned newest first, one page at a time
+        query = {"user_id": str(user["_id"])}
+        if cursor:
+            submitted_at, attempt_id = decode_cursor(cursor, 2)
+            query["$or"] = [
+                {"submitted_at": {"$lt": submitted_at}},
+                {"submitted_at": submitted_at, "_id": {"$lt": attempt_id}}
+            ]
+        
+        attempts = await db.quiz_attempts.find(query).sort(
+            [("submitted_at", -1), ("_id", -1)]
+        ).limit(limit + 1).to_list(length=limit + 1)
+        
+        next_cursor = None
+        if len(attempts) > limit:
+            attempts = attempts[:limit]
+            next_cursor = encode_cursor(attempts[-1]["submitted_at"], attempts[-1]["_id"])
         
         return {
-            "quiz_accuracy": quiz_accuracy,
-            "total_quizzes_completed": total_quizzes,
-            "average_score": average_score
+            "quiz_accuracy": [attempt_response(attempt) for attempt in attempts],
+            "total_quizzes_completed": user.get("total_quizzes_completed", 0),
+            "average_score": user.get("average_score", 0),
+            "course_stats": user.get("course_stats", {}),
+            "next_cursor": next_cursor
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching quiz accuracy: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching quiz accuracy: {str(e)}")
 
+@router.get("/quizzes/recent/{username}")
+async def get_recent_quizzes(username: str, limit: int = Query(5, ge=1, le=50)):
+    try:
+        db = await get_database()
+        user_id = await find_user_id(db, username)
+        
+        # Only the last N attempts, without their per-question answers
+        attempts = await db.quiz_attempts.find(
+            {"user_id": user_id},
+            {"answers": 0}
+        ).sort([("submitted_at", -1), ("_id", -1)]).limit(limit).to_list(length=limit)
+        
+        return {"quiz_accuracy": [attempt_response(attempt) for attempt in attempts]}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching recent quizzes: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching recent quizzes: {str(e)}")
+
 @router.get("/quizzes/{course_title}")
 async def get_quiz(course_title: str):
     try:
-        logger.info(f"Fetching quiz for course: {course_title}")
-        
         db = await get_database()
-        course = await db.courses.find_one({"title": course_title})
+        slug = slugify(course_title)
+        version = await catalog.current_version(db)
+        cached = _quizzes.get(slug)
+        if cached and cached[0] == version:
+            return Response(cached[1], media_type="application/json")
+        
+        logger.info(f"Fetching quiz for course: {course_title}")
+        course = await catalog.find_course(db, slug)
         if not course:
             logger.error(f"Course not found: {course_title}")
             raise HTTPException(status_code=404, detail="Course not found")
         
-        # Get or create quiz for the course
-        quiz = await db.quizzes.find_one({"course_id": str(course["_id"])})
-        if not quiz:
-            # Create a new quiz if it doesn't exist
-            quiz = {
-                "id": str(uuid.uuid4()),
-                "course_id": str(course["_id"]),
-                "questions": COURSE_QUESTIONS.get(course_title, [])
-            }
-            await db.quizzes.insert_one(quiz)
+        # Get or create the course's quiz in one atomic round trip
+        course_id = str(course["_id"])
+        try:
+            quiz = await db.quizzes.find_one_and_update(
+                {"course_id": course_id},
+                {"$setOnInsert": {
+                    "id": str(uuid.uuid4()),
+                    "questions": load_course_questions().get(course["title"], [])
+                }},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Another request created it between our match and insert
+            quiz = await db.quizzes.find_one({"course_id": course_id})
         
-        return convert_objectid_to_str(quiz)
+        body = dumps(quiz)
+        _quizzes[slug] = (version, body)
+        return Response(body, media_type="application/json")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching quiz: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching quiz: {str(e)}")
 
 @router.post("/quizzes/{course_id}/submit")
-async def submit_quiz(course_id: str, submission: QuizSubmission, current_user: dict = Depends(get_current_user)):
+async def submit_quiz(
+    course_id: str,
+    submission: QuizSubmission,
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(get_current_user)
+):
     try:
-        logger.info(f"Received quiz submission for course {course_id}")
-        logger.info(f"Current user data: {current_user}")
-        logger.info(f"Submission data: {submission.dict()}")
-        
         db = await get_database()
-        course = await db.courses.find_one({"_id": ObjectId(course_id)})
-        if not course:
+        plan = await get_grading_plan(db, course_id)
+        if not plan:
             logger.error(f"Course not found: {course_id}")
             raise HTTPException(status_code=404, detail="Course not found")
         
-        logger.info(f"Found course: {course['title']}")
-        
-        # Calculate score
-        correct_answers = 0
-        total_questions = 0
-        
-        # Count total questions across all lessons
-        for lesson in course.get("lessons", []):
-            if "quiz" in lesson:
-                total_questions += len(lesson["quiz"])
-        
-        logger.info(f"Total questions in course: {total_questions}")
-        
-        # Process each answer
-        for q_idx_str, selected_ans_idx in submission.answers.items():
-            q_idx = int(q_idx_str)
-            lesson_number = (q_idx // 5) + 1  # Calculate lesson number based on question index
-            question_index = q_idx % 5  # Get question index within the lesson
-            
-            # Find the corresponding lesson and question
-            for lesson in course.get("lessons", []):
-                if lesson.get("lesson_number") == lesson_number and "quiz" in lesson:
-                    if question_index < len(lesson["quiz"]):
-                        question = lesson["quiz"][question_index]
-                        correct_answer_index = question["correct_answer"]
-                        
-                        logger.info(f"\nQuestion {q_idx}:")
-                        logger.info(f"Submitted answer index: {selected_ans_idx}")
-                        logger.info(f"Correct answer index: {correct_answer_index}")
-                        logger.info(f"Options: {question['options']}")
-                        
-                        if selected_ans_idx == correct_answer_index:
-                            correct_answers += 1
-                            logger.info("Answer is correct!")
-                        else:
-                            logger.info("Answer is incorrect")
-                    break
-        
+        # Grade against the compiled answer key
+        total_questions = plan.total_questions
+        correct_answers = plan.grade(submission.answers)
         score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
-        logger.info(f"\nFinal score calculation:")
-        logger.info(f"Correct answers: {correct_answers}")
-        logger.info(f"Total questions: {total_questions}")
-        logger.info(f"Score: {score}%")
+        log_answers(plan, submission.answers)
         
         # Create quiz accuracy record
         quiz_accuracy = QuizAccuracy(
-            quiz_id=course_id,
-            course_title=course["title"],
+            user_id=current_user["id"],
+            course_id=plan.course_id,
+            quiz_id=plan.course_id,
+            course_title=plan.course_title,
             score=score,
-            answers={str(k): str(v) for k, v in submission.answers.items()}  # Convert both keys and values to strings
+            answers={str(k): v for k, v in submission.answers.items()}  # Keys must be strings; selected options stay integers for analytics
         )
         
-        # Get current user data for stats calculation
-        user = await db.users.find_one({"_id": ObjectId(current_user["id"])})
+        # Update user's stats atomically; no read-before-write, so concurrent submissions can't lose updates
+        user = await db.users.find_one_and_update(
+            {"_id": ObjectId(current_user["id"])},
+            quiz_stats_update(plan.course_id, plan.course_title, score, quiz_accuracy.submitted_at),
+            projection={
+                "username": 1,
+                "average_score": 1,
+                "total_quizzes_completed": 1,
+                f"course_stats.{plan.course_id}.best_score": 1
+            },
+            return_document=ReturnDocument.AFTER
+        )
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
+        leaderboard.record_quiz_stats(user)
         
-        # Update user's quiz accuracy and stats
-        await db.users.update_one(
-            {"_id": ObjectId(current_user["id"])},
-            {
-                "$push": {"quiz_accuracy": quiz_accuracy.dict()},
-                "$inc": {"total_quizzes_completed": 1},
-                "$set": {
-                    "average_score": (
-                        (user.get("average_score", 0) * user.get("total_quizzes_completed", 0) + score) /
-                        (user.get("total_quizzes_completed", 0) + 1)
-                    )
-                }
-            }
-        )
+        # Attempts live in their own collection so the user document stays small
+        await db.quiz_attempts.insert_one(quiz_accuracy.to_document())
+        
+        logger.info(LogFields(
+            "Quiz submitted",
+            user_id=current_user["id"],
+            course_id=plan.course_id,
+            correct=correct_answers,
+            total=total_questions,
+            score=round(score, 1)
+        ))
         
-        logger.info(f"Updated user's quiz accuracy and stats")
+        # Followers' feeds are updated after the response is sent
+        background_tasks.add_task(fan_out_quiz_completion, db, current_user["id"], quiz_accuracy)
         
         return {
             "score": score,
@@ -167,6 +264,8 @@ async def submit_quiz(course_id: str, submission: QuizSubmission, current_user:
             "total_questions": total_questions
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error submitting quiz: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error submitting quiz: {str(e)}") 
\ No newline at end of file
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from passlib.context import CryptContext
-from models.user import UserCreate, UserResponse, UserProfileResponse, LoginHistory
-from database import get_database
+from models.user import UserCreate, UserResponse, UserProfileResponse, LoginHistory, FollowEdge
+from database import get_database, duplicate_key_field
 import logging
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
@@ -11,7 +11,12 @@ from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from bson.objectid import ObjectId
-from auth import get_current_user, create_access_token, get_password_hash, verify_password
+from pymongo.errors import DuplicateKeyError
+from pagination import encode_cursor, decode_cursor
+from feed import read_feed
+import leaderboard
+from cache import TTLCache
+from auth import get_current_user, create_access_token, get_password_hash_async, verify_password_async
 
 # Load environment variables
 load_dotenv()
@@ -27,6 +32,24 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-here")  # Fallback for
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Only the most recent logins are kept on the user document
+LOGIN_HISTORY_LIMIT = int(os.getenv("LOGIN_HISTORY_LIMIT", "30"))
+
+# Authenticated principals (id and username) cached per user id, so auth isn't a
+# database round trip on every request. Entries are dropped on rename and deletion, but
+# only in the worker that handled it: other workers can keep a renamed or deleted account's
+# principal for up to PRINCIPAL_CACHE_TTL_SECONDS. Authorization therefore compares ids,
+# never the cached username, and writes keyed by the id match nothing once it's deleted.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+# Fields needed to render a public profile
+PROFILE_PROJECTION = {
+    "username": 1, "email": 1, "role": 1, "created_at": 1, "about": 1,
+    "followers_count": 1, "following_count": 1
+}
+
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
@@ -40,8 +63,6 @@ class UserProfileResponse(BaseModel):
     role: str = "Student"  # Default role
     joined_date: datetime
     about: str = ""  # Default empty bio
-    followers: list
-    following: list
     followers_count: int
     following_count: int
 
@@ -68,16 +89,21 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
         
-        db = await get_database()
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
+        principal = principal_cache.get(user_id)
+        if principal is None:
+            db = await get_database()
+            user = await db.users.find_one({"_id": ObjectId(user_id)}, {"username": 1})
 
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+            if not user:
+                raise HTTPException(status_code=404, detail="User not found")
 
-        return {
-            "id": str(user["_id"]),
-            "username": user["username"]
-        }
+            principal = {
+                "id": str(user["_id"]),
+                "username": user["username"]
+            }
+            principal_cache.set(user_id, principal)
+
+        return dict(principal)
 
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
@@ -92,9 +118,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def update_streak(user: dict) -> dict:
-    """Update user's streak based on login history"""
-    now = datetime.utcnow()
+def update_streak(user: dict, now: Optional[datetime] = None) -> dict:
+    """Compute the user's streak fields for a login at `now` from their last login"""
+    now = now or datetime.utcnow()
     today = now.date()
     
     # Get the last login date
@@ -120,20 +146,44 @@ def update_streak(user: dict) -> dict:
     if current_streak > longest_streak:
         longest_streak = current_streak
     
-    # Add login history entry
-    login_history = user.get('login_history', [])
-    login_history.append(LoginHistory(
-        date=now,
-        streak_count=current_streak
-    ).dict())
-    
-    # Update user document
-    user['current_streak'] = current_streak
-    user['longest_streak'] = longest_streak
-    user['last_login'] = now
-    user['login_history'] = login_history
-    
-    return user
+    return {
+        'current_streak': current_streak,
+        'longest_streak': longest_streak,
+        'last_login': now
+    }
+
+async def record_login(db, user: dict) -> dict:
+    """Update the streak and append a capped login history entry.
+
+    The update only applies if last_login is still the value the streak was computed
+    from, so concurrent logins can't double-count a day. On a conflict the streak is
+    recomputed from the fresh values; if every retry conflicts, the stored streak is returned.
+    """
+    for _ in range(3):
+        streak = update_streak(user)
+        entry = LoginHistory(date=streak["last_login"], streak_count=streak["current_streak"]).dict()
+        result = await db.users.update_one(
+            {"_id": user["_id"], "last_login": user.get("last_login")},
+            {
+                "$set": streak,
+                "$push": {"login_history": {"$each": [entry], "$slice": -LOGIN_HISTORY_LIMIT}}
+            }
+        )
+        if result.matched_count:
+            return streak
+        user = await db.users.find_one(
+            {"_id": user["_id"]},
+            {"current_streak": 1, "longest_streak": 1, "last_login": 1}
+        )
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+    # Other logins kept winning; they recorded today's login, so report what they stored
+    logger.warning(f"Login for user {user['_id']} lost every streak update to concurrent logins")
+    return {
+        "current_streak": user.get("current_streak", 0),
+        "longest_streak": user.get("longest_streak", 0),
+        "last_login": user.get("last_login")
+    }
 
 @router.post("/", response_model=UserResponse)
 async def create_user(user: UserCreate):
@@ -141,45 +191,38 @@ async def create_user(user: UserCreate):
         logger.info(f"Creating new user: {user.username}")
         db = await get_database()
         
-        # Check if username already exists
-        if await db.users.find_one({"username": user.username}):
-            logger.error(f"Username already exists: {user.username}")
-            raise HTTPException(status_code=400, detail="Username already registered")
-        
-        # Check if email already exists
-        if await db.users.find_one({"email": user.email}):
-            logger.error(f"Email already registered: {user.email}")
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
         # Create user document
         user_doc = {
             "username": user.username,
             "email": user.email,
-            "password": get_password_hash(user.password),
+            "password": await get_password_hash_async(user.password),
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow(),
-            "followers": [],
-            "following": [],
+            "followers_count": 0,
+            "following_count": 0,
             "current_streak": 0,
             "longest_streak": 0,
             "last_login": None,
             "login_history": []
         }
         
-        # Insert user into database
-        result = await db.users.insert_one(user_doc)
+        # The unique username and email indexes reject duplicates, so no pre-checks are needed
+        try:
+            result = await db.users.insert_one(user_doc)
+        except DuplicateKeyError as e:
+            if duplicate_key_field(e) == "email":
+                logger.error(f"Email already registered: {user.email}")
+                raise HTTPException(status_code=400, detail="Email already registered")
+            logger.error(f"Username already exists: {user.username}")
+            raise HTTPException(status_code=400, detail="Username already registered")
         logger.info(f"Successfully created user: {user.username}")
         
-        # Get the created user with all fields
-        created_user = await db.users.find_one({"_id": result.inserted_id})
-        
-        # Return the user data
         return UserResponse(
-            id=str(created_user["_id"]),
-            username=created_user["username"],
-            email=created_user["email"],
-            created_at=created_user["created_at"],
-            updated_at=created_user["updated_at"]
+            id=str(result.inserted_id),
+            username=user_doc["username"],
+            email=user_doc["email"],
+            created_at=user_doc["created_at"],
+            updated_at=user_doc["updated_at"]
         )
         
     except HTTPException as he:
@@ -195,24 +238,17 @@ async def create_user(user: UserCreate):
 async def login(login_data: LoginRequest):
     try:
         db = await get_database()
-        user = await db.users.find_one({"email": login_data.email})
+        user = await db.users.find_one(
+            {"email": login_data.email},
+            {"username": 1, "email": 1, "password": 1, "current_streak": 1, "longest_streak": 1, "last_login": 1}
+        )
         
-        if not user or not verify_password(login_data.password, user["password"]):
+        if not user or not await verify_password_async(login_data.password, user["password"]):
             raise HTTPException(status_code=401, detail="Invalid email or password")
         
         # Update streak information
-        user = update_streak(user)
-        await db.users.update_one(
-            {"_id": user["_id"]},
-            {
-                "$set": {
-                    "current_streak": user["current_streak"],
-                    "longest_streak": user["longest_streak"],
-                    "last_login": user["last_login"],
-                    "login_history": user["login_history"]
-                }
-            }
-        )
+        user.update(await record_login(db, user))
+        leaderboard.record_streak(str(user["_id"]), user["username"], user["longest_streak"])
         
         # Create access token
         access_token = create_access_token({"sub": str(user["_id"])})
@@ -228,6 +264,8 @@ async def login(login_data: LoginRequest):
                 "longest_streak": user["longest_streak"]
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error during login: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -236,7 +274,7 @@ async def login(login_data: LoginRequest):
 async def get_user_by_username(username: str):
     try:
         db = await get_database()
-        user = await db.users.find_one({"username": username})
+        user = await db.users.find_one({"username": username}, PROFILE_PROJECTION)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -248,10 +286,8 @@ async def get_user_by_username(username: str):
             role=user.get("role", "Student"),  # Default to Student if role not set
             joined_date=user.get("created_at", datetime.utcnow()),  # Default to current time if not set
             about=user.get("about", ""),  # Default to empty string if about not set
-            followers=user.get("followers", []),
-            following=user.get("following", []),
-            followers_count=len(user.get("followers", [])),
-            following_count=len(user.get("following", []))
+            followers_count=user.get("followers_count", 0),
+            following_count=user.get("following_count", 0)
         )
     except Exception as e:
         logger.error(f"Error fetching user by username: {str(e)}")
@@ -261,8 +297,6 @@ async def get_user_by_username(username: str):
 async def update_user(username: str, user_data: UserUpdate, current_user: dict = Depends(get_current_user)):
     try:
         logger.info(f"Starting profile update for user: {username}")
-        logger.info(f"Current user from token: {current_user}")
-        logger.info(f"Update data received: {user_data.model_dump()}")
         
         db = await get_database()
         
@@ -272,11 +306,11 @@ async def update_user(username: str, user_data: UserUpdate, current_user: dict =
             logger.error(f"User not found: {username}")
             raise HTTPException(status_code=404, detail="User not found")
         
-        logger.info(f"Found user in database: {user}")
+        logger.debug(f"Found user {user['_id']} for {username}")
         
-        # Ensure only the user can update their own profile
-        if user["username"] != current_user["username"]:
-            logger.error(f"Unauthorized update attempt. Current user: {current_user['username']}, Target user: {username}")
+        # Ensure only the user can update their own profile; ids are never reused, usernames are
+        if str(user["_id"]) != current_user["id"]:
+            logger.error(f"Unauthorized update attempt. Current user: {current_user['id']}, Target user: {username}")
             raise HTTPException(status_code=403, detail="Not authorized to update this profile")
         
         # Check if new username is already taken by another user
@@ -313,16 +347,14 @@ async def update_user(username: str, user_data: UserUpdate, current_user: dict =
                 role=user.get("role", "Student"),
                 joined_date=user.get("created_at", datetime.utcnow()),
                 about=user.get("about", ""),
-                followers=user.get("followers", []),
-                following=user.get("following", []),
-                followers_count=len(user.get("followers", [])),
-                following_count=len(user.get("following", []))
+                followers_count=user.get("followers_count", 0),
+                following_count=user.get("following_count", 0)
             )
         
         # Add updated_at timestamp
         update_fields["updated_at"] = datetime.utcnow()
         
-        logger.info(f"Updating user with fields: {update_fields}")
+        logger.info(f"Updating user fields: {', '.join(update_fields)}")
         
         try:
             # Perform the update
@@ -335,6 +367,10 @@ async def update_user(username: str, user_data: UserUpdate, current_user: dict =
                 logger.error("No changes made to the database")
                 raise HTTPException(status_code=400, detail="No changes made")
             
+            if "username" in update_fields:
+                principal_cache.pop(str(user["_id"]))
+                leaderboard.rename_user(str(user["_id"]), update_fields["username"])
+            
             # Get the updated user data
             updated_user = await db.users.find_one({"_id": user["_id"]})
             
@@ -351,10 +387,8 @@ async def update_user(username: str, user_data: UserUpdate, current_user: dict =
                 role=updated_user.get("role", "Student"),
                 joined_date=updated_user.get("created_at", datetime.utcnow()),
                 about=updated_user.get("about", ""),
-                followers=updated_user.get("followers", []),
-                following=updated_user.get("following", []),
-                followers_count=len(updated_user.get("followers", [])),
-                following_count=len(updated_user.get("following", []))
+                followers_count=updated_user.get("followers_count", 0),
+                following_count=updated_user.get("following_count", 0)
             )
             
         except Exception as db_error:
@@ -371,36 +405,72 @@ async def update_user(username: str, user_data: UserUpdate, current_user: dict =
         logger.error(f"Error details: {e.__dict__ if hasattr(e, '__dict__') else 'No details available'}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def find_user_id_by_username(db, username: str) -> str:
+    user = await db.users.find_one({"username": username}, {"_id": 1})
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return str(user["_id"])
+
+async def adjust_follow_counts(db, follower_id: str, followee_id: str, delta: int) -> bool:
+    """Apply delta to both counters; False if the follower's account no longer exists"""
+    try:
+        result = await db.users.update_one({"_id": ObjectId(follower_id)}, {"$inc": {"following_count": delta}})
+        if not result.matched_count:
+            return False
+        await db.users.update_one({"_id": ObjectId(followee_id)}, {"$inc": {"followers_count": delta}})
+        return True
+    except Exception as e:
+        # The edge already changed; migrate_follow_edges recounts marked users from the edges
+        logger.error(f"Error adjusting follow counts for {follower_id} -> {followee_id}: {str(e)}")
+        await db.users.update_many(
+            {"_id": {"$in": [ObjectId(follower_id), ObjectId(followee_id)]}},
+            {"$set": {"follow_counts_stale": True}}
+        )
+        raise
+
+async def remove_follow_edges(db, user_id: str):
+    # Drop a deleted account's edges and the counters they contributed to other users
+    following = await db.follows.find({"follower_id": user_id}, {"followee_id": 1}).to_list(length=None)
+    if following:
+        await db.users.update_many(
+            {"_id": {"$in": [ObjectId(edge["followee_id"]) for edge in following]}},
+            {"$inc": {"followers_count": -1}}
+        )
+    followers = await db.follows.find({"followee_id": user_id}, {"follower_id": 1}).to_list(length=None)
+    if followers:
+        await db.users.update_many(
+            {"_id": {"$in": [ObjectId(edge["follower_id"]) for edge in followers]}},
+            {"$inc": {"following_count": -1}}
+        )
+    await db.follows.delete_many({"$or": [{"follower_id": user_id}, {"followee_id": user_id}]})
+
 @router.post("/username/{username}/follow")
 async def follow_user(username: str, current_user: dict = Depends(get_current_user)):
     try:
         db = await get_database()
         
         # Check if user exists
-        user_to_follow = await db.users.find_one({"username": username})
-        if not user_to_follow:
-            raise HTTPException(status_code=404, detail="User not found")
+        followee_id = await find_user_id_by_username(db, username)
         
         # Check if trying to follow self
-        if username == current_user["username"]:
+        if followee_id == current_user["id"]:
             raise HTTPException(status_code=400, detail="Cannot follow yourself")
         
-        # Check if already following
-        if username in current_user.get("following", []):
+        # The unique (follower_id, followee_id) index rejects duplicate follows
+        edge = FollowEdge(follower_id=current_user["id"], followee_id=followee_id)
+        try:
+            await db.follows.insert_one(edge.dict())
+        except DuplicateKeyError:
             raise HTTPException(status_code=400, detail="Already following this user")
         
-        # Update both users
-        await db.users.update_one(
-            {"username": username},
-            {"$push": {"followers": current_user["username"]}}
-        )
-        
-        await db.users.update_one(
-            {"username": current_user["username"]},
-            {"$push": {"following": username}}
-        )
+        if not await adjust_follow_counts(db, current_user["id"], followee_id, 1):
+            # The account was deleted while another worker still had its principal cached
+            await db.follows.delete_one({"follower_id": current_user["id"], "followee_id": followee_id})
+            raise HTTPException(status_code=404, detail="User not found")
         
         return {"message": f"Successfully followed {username}"}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error following user: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -411,30 +481,121 @@ async def unfollow_user(username: str, current_user: dict = Depends(get_current_
         db = await get_database()
         
         # Check if user exists
-        user_to_unfollow = await db.users.find_one({"username": username})
-        if not user_to_unfollow:
-            raise HTTPException(status_code=404, detail="User not found")
+        followee_id = await find_user_id_by_username(db, username)
         
         # Check if actually following
-        if username not in current_user.get("following", []):
+        result = await db.follows.delete_one({"follower_id": current_user["id"], "followee_id": followee_id})
+        if result.deleted_count == 0:
             raise HTTPException(status_code=400, detail="Not following this user")
         
-        # Update both users
-        await db.users.update_one(
-            {"username": username},
-            {"$pull": {"followers": current_user["username"]}}
-        )
-        
-        await db.users.update_one(
-            {"username": current_user["username"]},
-            {"$pull": {"following": username}}
-        )
+        await adjust_follow_counts(db, current_user["id"], followee_id, -1)
         
         return {"message": f"Successfully unfollowed {username}"}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error unfollowing user: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def list_follow_edges(db, field: str, user_id: str, other_field: str, limit: int, cursor: Optional[str]) -> dict:
+    query = {field: user_id}
+    if cursor:
+        (edge_id,) = decode_cursor(cursor, 1)
+        query["_id"] = {"$lt": edge_id}
+    
+    # Newest edges first, one page at a time
+    edges = await db.follows.find(query, {other_field: 1}).sort("_id", -1).limit(limit + 1).to_list(length=limit + 1)
+    next_cursor = None
+    if len(edges) > limit:
+        edges = edges[:limit]
+        next_cursor = encode_cursor(edges[-1]["_id"])
+    
+    # Resolve the page's user ids to usernames in one query
+    users = await db.users.find(
+        {"_id": {"$in": [ObjectId(edge[other_field]) for edge in edges]}},
+        {"username": 1}
+    ).to_list(length=len(edges))
+    usernames = {str(user["_id"]): user["username"] for user in users}
+    
+    return {
+        "users": [
+            {"username": usernames[edge[other_field]]}
+            for edge in edges if edge[other_field] in usernames
+        ],
+        "next_cursor": next_cursor
+    }
+
+@router.get("/username/{username}/followers")
+async def get_followers(username: str, limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = None):
+    try:
+        db = await get_database()
+        user_id = await find_user_id_by_username(db, username)
+        return await list_follow_edges(db, "followee_id", user_id, "follower_id", limit, cursor)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching followers: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/username/{username}/following")
+async def get_following(username: str, limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = None):
+    try:
+        db = await get_database()
+        user_id = await find_user_id_by_username(db, username)
+        return await list_follow_edges(db, "follower_id", user_id, "followee_id", limit, cursor)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching following: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/username/{username}/following/{other_username}")
+async def is_following(username: str, other_username: str):
+    try:
+        db = await get_database()
+        users = await db.users.find(
+            {"username": {"$in": [username, other_username]}},
+            {"username": 1}
+        ).to_list(length=2)
+        ids = {user["username"]: str(user["_id"]) for user in users}
+        if username not in ids or other_username not in ids:
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        # Point read on the unique (follower_id, followee_id) index
+        edge = await db.follows.find_one(
+            {"follower_id": ids[username], "followee_id": ids[other_username]},
+            {"_id": 1}
+        )
+        return {"following": edge is not None}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error checking follow status: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/me/feed")
+async def get_feed(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        db = await get_database()
+        before = tuple(decode_cursor(cursor, 2)) if cursor else None
+        events = await read_feed(db, current_user["id"], limit, before)
+        
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = encode_cursor(events[-1]["created_at"], events[-1]["id"])
+        
+        return {"events": events, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching feed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     try:
@@ -448,7 +609,10 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
             logger.error(f"Invalid user ID format: {current_user['id']}")
             raise HTTPException(status_code=400, detail="Invalid user ID format")
         
-        user = await db.users.find_one({"_id": user_id})
+        user = await db.users.find_one(
+            {"_id": user_id},
+            {"password": 0, "login_history": {"$slice": -LOGIN_HISTORY_LIMIT}}
+        )
         
         if not user:
             logger.error(f"User not found with ID: {current_user['id']}")
@@ -470,10 +634,8 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
             "last_login": user.get("last_login"),
             "role": user.get("role", "Student"),
             "about": user.get("about", ""),
-            "followers": user.get("followers", []),
-            "following": user.get("following", []),
-            "followers_count": len(user.get("followers", [])),
-            "following_count": len(user.get("following", [])),
+            "followers_count": user.get("followers_count", 0),
+            "following_count": user.get("following_count", 0),
             "created_at": user.get("created_at", datetime.utcnow()),
             "updated_at": user.get("updated_at", datetime.utcnow())
         }
@@ -488,7 +650,10 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
 async def get_user(username: str):
     try:
         db = await get_database()
-        user = await db.users.find_one({"username": username})
+        user = await db.users.find_one(
+            {"username": username},
+            {"password": 0, "login_history": {"$slice": -LOGIN_HISTORY_LIMIT}}
+        )
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -503,7 +668,6 @@ async def get_user(username: str):
 async def delete_user(username: str, current_user: dict = Depends(get_current_user)):
     try:
         logger.info(f"Starting account deletion for user: {username}")
-        logger.info(f"Current user from token: {current_user}")
         
         db = await get_database()
         
@@ -513,11 +677,11 @@ async def delete_user(username: str, current_user: dict = Depends(get_current_us
             logger.error(f"User not found: {username}")
             raise HTTPException(status_code=404, detail="User not found")
         
-        logger.info(f"Found user in database: {user}")
+        logger.debug(f"Found user {user['_id']} for {username}")
         
-        # Ensure only the user can delete their own account
-        if user["username"] != current_user["username"]:
-            logger.error(f"Unauthorized deletion attempt. Current user: {current_user['username']}, Target user: {username}")
+        # Ensure only the user can delete their own account; ids are never reused, usernames are
+        if str(user["_id"]) != current_user["id"]:
+            logger.error(f"Unauthorized deletion attempt. Current user: {current_user['id']}, Target user: {username}")
             raise HTTPException(status_code=403, detail="Not authorized to delete this account")
         
         try:
@@ -528,6 +692,10 @@ async def delete_user(username: str, current_user: dict = Depends(get_current_us
                 logger.error("No user was deleted")
                 raise HTTPException(status_code=500, detail="Failed to delete account")
             
+            principal_cache.pop(str(user["_id"]))
+            await remove_follow_edges(db, str(user["_id"]))
+            leaderboard.remove_user(str(user["_id"]))
+            
             logger.info(f"Successfully deleted user account: {username}")
             return {"message": "Account deleted successfully"}
             
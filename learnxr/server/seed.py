@@ -0,0 +1,41 @@
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+from models.quiz import question_id
+
+# Seed content lives in gzipped JSON next to the code and is only read when seeding or
+# creating a quiz. The files are written with mtime=0 so identical content gives identical bytes.
+DATA_DIR = Path(__file__).resolve().parent / "data"
+INITIAL_COURSES_FILE = DATA_DIR / "initial_courses.json.gz"
+COURSE_QUESTIONS_FILE = DATA_DIR / "course_questions.json.gz"
+
+# meta document recording the fingerprint of the last seed applied to the database
+SEED_META_ID = "course_seed"
+
+def _read(path: Path):
+    with gzip.open(path, "rb") as f:
+        return json.load(f)
+
+@lru_cache(maxsize=None)
+def seed_fingerprint() -> str:
+    """Hash of the seed files' bytes; changes whenever the seed content changes"""
+    digest = hashlib.sha256()
+    for path in (INITIAL_COURSES_FILE, COURSE_QUESTIONS_FILE):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def load_initial_courses() -> List[dict]:
+    """A fresh copy of the seed courses; callers may modify it"""
+    return _read(INITIAL_COURSES_FILE)
+
+@lru_cache(maxsize=None)
+def load_course_questions() -> Dict[str, List[dict]]:
+    """Sample quiz questions by course title, with deterministic question ids. Treat as read-only."""
+    course_questions = _read(COURSE_QUESTIONS_FILE)
+    for course_title, questions in course_questions.items():
+        for question in questions:
+            question["id"] = question_id(course_title, question["text"])
+    return course_questions
@@ -0,0 +1,26 @@
+import orjson
+from bson import ObjectId, Decimal128
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+def _default(obj):
+    # Only called for types orjson can't encode natively (dict, list, str, datetime, ... are handled in C)
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return str(obj.to_decimal())
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content) -> bytes:
+    """Serialize Motor documents (ObjectId, datetime, nested lists) straight to JSON bytes in one pass"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class MongoJSONResponse(JSONResponse):
+    """Default response class. Routes that return raw Mongo documents should return this directly,
+    which skips FastAPI's jsonable_encoder walk entirely."""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
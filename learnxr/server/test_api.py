@@ -1,5 +1,6 @@
 import requests
 import json
+from roundtrips import assert_round_trips
 
 BASE_URL = "http://localhost:8000"
 
@@ -40,6 +41,19 @@ def test_root():
     print(f"Status Code: {response.status_code}")
     print(f"Response: {response.json()}")
 
+# Most Mongo round trips each endpoint may make; catches N+1 regressions
+ROUND_TRIP_BUDGETS = {
+    "/": 0,
+    "/api/courses": 1
+}
+
+def test_round_trip_budgets():
+    for path, budget in ROUND_TRIP_BUDGETS.items():
+        response = requests.get(f"{BASE_URL}{path}")
+        print(f"\nTesting round trips for {path}: {response.headers.get('Server-Timing')}")
+        assert_round_trips(response, budget)
+
 if __name__ == "__main__":
     test_root()
-    test_create_user() 
\ No newline at end of file
+    test_create_user()
+    test_round_trip_budgets()
\ No newline at end of file
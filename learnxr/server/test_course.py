@@ -0,0 +1,14 @@
+from models.course import slugify
+from seed import load_initial_courses
+
+def test_slugify_keeps_symbols_that_distinguish_titles():
+    titles = ["C", "C++", "C#", "C & C++"]
+    assert [slugify(title) for title in titles] == ["c", "c-plus-plus", "c-sharp", "c-and-c-plus-plus"]
+
+def test_slugify_collapses_other_punctuation():
+    assert slugify("  Data_Science: 101! ") == "data-science-101"
+    assert slugify(slugify("C++ Basics")) == slugify("C++ Basics")
+
+def test_seed_course_slugs_are_unique():
+    slugs = [slugify(course["title"]) for course in load_initial_courses()]
+    assert len(set(slugs)) == len(slugs)
@@ -0,0 +1,30 @@
+import asyncio
+import sys
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+import lifecycle
+
+class DrainingServer(Server):
+    """Uvicorn server that keeps serving for DRAIN_SECONDS after the first shutdown signal.
+
+    During that window /ready returns 503, so load balancers take the worker out of
+    rotation before it stops accepting connections. A second signal exits immediately.
+    """
+
+    def handle_exit(self, sig, frame):
+        if lifecycle.DRAIN_SECONDS <= 0 or lifecycle.state() == lifecycle.DRAINING:
+            return super().handle_exit(sig, frame)
+        lifecycle.start_draining()
+        asyncio.get_running_loop().call_later(lifecycle.DRAIN_SECONDS, super().handle_exit, sig, frame)
+
+class DrainingUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {"loop": "auto", "http": "auto", "lifespan": "on"}
+
+    async def _serve(self):
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)